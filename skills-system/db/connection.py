@@ -1,6 +1,10 @@
 """SQLite connection for ~/life/life.db."""
 
+import atexit
+import os
 import sqlite3
+import threading
+import weakref
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -8,6 +12,32 @@ DB_PATH = Path.home() / "life" / "life.db"
 
 _schema_initialized = False
 
+# Per-thread cached connection for shared_db()
+_local = threading.local()
+
+
+class _ThreadConnection:
+    """A thread's shared_db() connection, closed when the thread's locals are freed."""
+
+    __slots__ = ("conn", "path", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, path: Path):
+        self.conn = conn
+        self.path = path
+
+    def __del__(self):
+        self.conn.close()
+
+
+# Live shared_db() connections, for the ones whose threads outlive atexit
+_thread_conns: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_thread_conns() -> None:
+    for holder in list(_thread_conns):
+        holder.conn.close()
+
 
 def _ensure_schema(conn: sqlite3.Connection) -> None:
     """Create tables if they don't exist. Runs once per process."""
@@ -37,21 +67,95 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
             session_id TEXT DEFAULT '',
             payload TEXT DEFAULT ''
         );
+        -- Active-span lookup on every Read/Task hook (step_gate,
+        -- subagent_step_tracker): index seek instead of scan + sort
+        CREATE INDEX IF NOT EXISTS idx_skill_span_active
+            ON skill_span(skill, session_id, started_at DESC)
+            WHERE status = 'active';
+        -- Open spans of a session, newest first (skill_queue_reminder on every
+        -- prompt, session_end, pre_compact): seek + LIMIT 1, no sort
+        CREATE INDEX IF NOT EXISTS idx_skill_span_open
+            ON skill_span(session_id, started_at DESC)
+            WHERE status IN ('active', 'suspended');
+        -- Per-session status lookups that the partial indexes above can't
+        -- serve (status = 'suspended' on resume, skill != ? on skill switch)
+        CREATE INDEX IF NOT EXISTS idx_skill_span_session_status
+            ON skill_span(session_id, status, skill);
+        -- Visit count per step on every step Read (step_logger): covering
+        -- index count instead of a life_event scan
+        CREATE INDEX IF NOT EXISTS idx_life_event_step
+            ON life_event(skill, phase, event_type);
+        -- Visited steps, one row per step (see db.span). Replaces the
+        -- skill_span.steps JSON array, which is no longer written.
+        CREATE TABLE IF NOT EXISTS skill_span_steps (
+            span_id TEXT NOT NULL,
+            pos INTEGER NOT NULL,
+            step TEXT NOT NULL,
+            PRIMARY KEY (span_id, pos)
+        ) WITHOUT ROWID;
     """)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+        # One-time backfill of skill_span_steps from the legacy JSON column.
+        # INSERT OR IGNORE keeps it idempotent if two processes race here.
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO skill_span_steps (span_id, pos, step) "
+                "SELECT s.span_id, j.key, j.value FROM skill_span s, json_each(s.steps) j "
+                "WHERE json_valid(s.steps)"
+            )
+            conn.execute("PRAGMA user_version = 1")
     _schema_initialized = True
 
 
-@contextmanager
-def open_db():
-    """Context-managed SQLite connection. Always closes, even on exception."""
+def _connect(check_same_thread: bool = True) -> sqlite3.Connection:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL stays consistent on power loss with NORMAL; commits skip the
+    # per-transaction fsync (the WAL is synced at checkpoints)
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA busy_timeout=5000")
     conn.execute("PRAGMA foreign_keys=ON")
     _ensure_schema(conn)
+    return conn
+
+
+@contextmanager
+def open_db():
+    """Context-managed SQLite connection. Always closes, even on exception."""
+    conn = _connect()
     try:
         yield conn
     finally:
         conn.close()
+
+
+@contextmanager
+def shared_db():
+    """Thread-local connection reused across calls within one process.
+
+    For hook hosts that stay alive across tool calls: skips connect, PRAGMAs
+    and the WAL attach on every call. The connection is closed when its
+    thread exits, or at process exit for threads still alive then; an
+    exception inside the block rolls back any open transaction so the next
+    caller starts clean. SKILLS_DB_ONESHOT=1 falls back to open_db().
+    """
+    if os.environ.get("SKILLS_DB_ONESHOT"):
+        with open_db() as conn:
+            yield conn
+        return
+
+    holder = getattr(_local, "holder", None)
+    if holder is None or holder.path != DB_PATH:
+        # Used only by this thread, but the atexit hook may close it from the
+        # main thread. Replacing a holder closes the previous connection.
+        holder = _ThreadConnection(_connect(check_same_thread=False), DB_PATH)
+        _thread_conns.add(holder)
+        _local.holder = holder
+    conn = holder.conn
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
@@ -1,42 +1,93 @@
 """Life event tracking — phase-level breadcrumbs for skills."""
 
-import json
 import logging
+import os
+import sqlite3
+from collections.abc import Iterable
+from contextlib import contextmanager
 from dataclasses import asdict
 
-from .connection import open_db
+from . import fastjson
+from .connection import shared_db
 from .models import LifeEvent
 
 logger = logging.getLogger(__name__)
 
+# Nesting depth of suppress_events() blocks
+_suppressed = 0
+
+
+@contextmanager
+def suppress_events():
+    """Drop every emit_event call made inside the block (tests, benchmarks)."""
+    global _suppressed
+    _suppressed += 1
+    try:
+        yield
+    finally:
+        _suppressed -= 1
+
+
+_INSERT_EVENT = (
+    "INSERT INTO life_event (id, timestamp, skill, phase, event_type, session_id, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _event_row(
+    skill: str, phase: str, event_type: str, session_id: str, payload: dict | None
+) -> tuple | None:
+    """Row for _INSERT_EVENT, or None if the event should be dropped."""
+    if _suppressed or skill.startswith("_") or os.environ.get("SKILLS_EMIT_DISABLED"):
+        return None
 
-def emit_event(
-    skill: str,
-    phase: str,
-    event_type: str = "phase_enter",
-    session_id: str = "",
-    payload: dict | None = None,
-) -> str | None:
-    """Emit a life event. Returns event ID. Fails open on DB errors."""
     event = LifeEvent(
         skill=skill,
         phase=phase,
         event_type=event_type,
         session_id=session_id,
-        payload=json.dumps(payload) if payload else "",
+        payload=fastjson.dumps(payload) if payload else "",
     )
     data = asdict(event)
+    return (data["id"], data["timestamp"], data["skill"], data["phase"],
+            data["event_type"], data["session_id"], data["payload"])
+
+
+def emit_event(
+    skill: str,
+    phase: str,
+    event_type: str = "phase_enter",
+    session_id: str = "",
+    payload: dict | None = None,
+) -> str | None:
+    """Emit a life event. Returns event ID. Fails open on DB errors.
+
+    Returns None without touching the DB for internal skills ("_" prefix),
+    inside suppress_events(), or when SKILLS_EMIT_DISABLED is set.
+    """
+    row = _event_row(skill, phase, event_type, session_id, payload)
+    if row is None:
+        return None
 
     try:
-        with open_db() as db:
-            db.execute(
-                "INSERT INTO life_event (id, timestamp, skill, phase, event_type, session_id, payload) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (data["id"], data["timestamp"], data["skill"], data["phase"],
-                 data["event_type"], data["session_id"], data["payload"]),
-            )
+        with shared_db() as db:
+            db.execute(_INSERT_EVENT, row)
             db.commit()
-        return data["id"]
+        return row[0]
     except Exception as e:
         logger.warning("Failed to emit life event: %s", e)
         return None
+
+
+def emit_events(db: sqlite3.Connection, events: Iterable[tuple[str, str, str]]) -> list[str]:
+    """Insert (skill, phase, event_type) events on the caller's connection.
+
+    The rows join the caller's transaction, so a batch costs one commit
+    instead of one connection + commit per event. Same drop rules as
+    emit_event; DB errors propagate. Returns the IDs written.
+    """
+    rows = [row for skill, phase, event_type in events
+            if (row := _event_row(skill, phase, event_type, "", None)) is not None]
+    if rows:
+        db.executemany(_INSERT_EVENT, rows)
+    return [row[0] for row in rows]
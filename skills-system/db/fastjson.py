@@ -0,0 +1,22 @@
+"""JSON for life.db TEXT columns — orjson when installed, stdlib otherwise.
+
+Event payloads and step contracts are (de)serialized on hot hook paths.
+orjson is several times faster on these small dicts/lists; the stdlib
+fallback keeps it an optional dependency.
+"""
+
+try:
+    import orjson
+except ImportError:
+    import json
+
+    dumps = json.dumps
+    loads = json.loads
+else:
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    loads = orjson.loads
+
+__all__ = ["dumps", "loads"]
@@ -0,0 +1,26 @@
+"""Span step lists — one skill_span_steps row per visited step.
+
+Appends are a single INSERT: the next position comes from MAX(pos) on the
+(span_id, pos) primary key, so earlier steps are never read or rewritten.
+"""
+
+import sqlite3
+
+_APPEND_STEP = (
+    "INSERT INTO skill_span_steps (span_id, pos, step) "
+    "SELECT ?, COALESCE(MAX(pos) + 1, 0), ? FROM skill_span_steps WHERE span_id = ?"
+)
+
+
+def append_step(db: sqlite3.Connection, span_id: str, step: str) -> None:
+    """Append a step to a span. The caller owns the transaction."""
+    db.execute(_APPEND_STEP, (span_id, step, span_id))
+
+
+def span_steps(db: sqlite3.Connection, span_id: str) -> list[str]:
+    """Steps of a span in visit order."""
+    rows = db.execute(
+        "SELECT step FROM skill_span_steps WHERE span_id = ? ORDER BY pos",
+        (span_id,),
+    ).fetchall()
+    return [r[0] for r in rows]
@@ -0,0 +1,149 @@
+"""Fast parser for the flat YAML frontmatter in SKILL.md and step files.
+
+Frontmatter here is a handful of `key: value`, `key: [a, b]` and
+`- item` list lines. Parsing that by hand is ~10x cheaper than
+yaml.safe_load and keeps PyYAML off the import path of hooks that only
+need flat keys. Anything outside that grammar falls back to
+yaml.safe_load: quoted or block scalars, flow mappings, numbers,
+comments, continuation lines, list items at differing indents, bool/null
+spelled keys (`on:`), tabs, and characters outside YAML's printable set.
+The fast path only accepts input it parses exactly as PyYAML does.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+from pathlib import Path
+
+from hooks._patterns import FRONTMATTER_RE
+
+# Frontmatter sits at the top of the file; this covers it for every skill
+# seen so far. Longer blocks trigger a full read.
+HEAD_BYTES = 4096
+
+_KEY_RE = re.compile(r"([A-Za-z_][\w-]*):(?: +(.*))?")
+_ITEM_RE = re.compile(r"( *)- +(.*)")
+# Characters the flat grammar leaves to PyYAML: tabs, \r and other line
+# breaks, and anything outside YAML's printable set (which PyYAML rejects)
+_UNSAFE_RE = re.compile(
+    "[^\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff]"
+)
+# Plain scalar PyYAML resolves to a string: starts with a letter, "_" or "/",
+# no flow/comment/quote/mapping indicators anywhere
+_PLAIN_RE = re.compile(r"[A-Za-z_/][^\[\]{},#:'\"]*")
+
+# YAML 1.1 bool/null spellings (as resolved by PyYAML)
+_SPECIAL = {
+    **dict.fromkeys(("true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON"), True),
+    **dict.fromkeys(("false", "False", "FALSE", "no", "No", "NO", "off", "Off", "OFF"), False),
+    **dict.fromkeys(("null", "Null", "NULL"), None),
+}
+
+
+class _Unsupported(Exception):
+    """Line outside the flat grammar — defer to PyYAML."""
+
+
+def _scalar(value: str):
+    value = value.rstrip()
+    if not _PLAIN_RE.fullmatch(value):
+        raise _Unsupported(value)
+    return _SPECIAL.get(value, value)
+
+
+def _parse_flat(text: str) -> dict:
+    if _UNSAFE_RE.search(text):
+        raise _Unsupported(text)
+    out: dict = {}
+    current: list | None = None  # block list under the last bare `key:`
+    current_key = None
+    item_indent = None  # indent of current's items; all must match
+
+    for line in text.split("\n"):
+        if not line.strip():
+            continue
+        item = _ITEM_RE.fullmatch(line)
+        if item:
+            indent = item.group(1)
+            if current_key is None:
+                raise _Unsupported(line)
+            if current is None:
+                current = out[current_key] = []
+                item_indent = indent
+            elif indent != item_indent:
+                # Deeper "- x" continues the previous item; shallower is an error
+                raise _Unsupported(line)
+            current.append(_scalar(item.group(2)))
+            continue
+
+        match = _KEY_RE.fullmatch(line)
+        if not match:
+            raise _Unsupported(line)
+        key, value = match.group(1), (match.group(2) or "").strip()
+        if key in _SPECIAL:
+            raise _Unsupported(line)  # PyYAML resolves the key itself (on: -> True)
+        current = None
+        current_key = None
+        if not value:
+            out[key] = None
+            current_key = key  # may be followed by `- item` lines
+        elif value[0] == "[" and value[-1] == "]":
+            inner = value[1:-1].strip()
+            out[key] = [_scalar(v.strip()) for v in inner.split(",")] if inner else []
+        else:
+            out[key] = _scalar(value)
+    return out
+
+
+def parse_frontmatter(text: str) -> dict | None:
+    """Parse a frontmatter block (without the --- fences).
+
+    Returns the mapping ({} for an empty block), or None if the block is
+    not valid YAML or not a mapping.
+    """
+    try:
+        return _parse_flat(text)
+    except _Unsupported:
+        pass
+
+    import yaml
+
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError:
+        return None
+    if data is None:
+        return {}
+    return data if isinstance(data, dict) else None
+
+
+def _universal_newlines(text: str) -> str:
+    r"""\r\n and \r to \n, as text-mode reads (Path.read_text) translate them."""
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+
+def read_frontmatter(path: Path) -> dict | None:
+    """Read and parse a markdown file's frontmatter.
+
+    Only the first HEAD_BYTES are read unless the closing fence lies beyond
+    them. Line endings are normalised like a text-mode read, so CRLF files
+    parse the same as LF ones. Returns None if the file has no (valid)
+    frontmatter; raises OSError if it cannot be read and UnicodeDecodeError
+    if the bytes read are not valid UTF-8, as Path.read_text() does.
+    """
+    # Strict, like read_text(); incremental so a character split at
+    # HEAD_BYTES is not mistaken for invalid UTF-8
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        data = f.read(HEAD_BYTES)
+        if not data.startswith((b"---\n", b"---\r")):
+            return None
+        text = decoder.decode(data, final=len(data) < HEAD_BYTES)
+        match = FRONTMATTER_RE.match(_universal_newlines(text))
+        if match is None and len(data) == HEAD_BYTES:
+            text += decoder.decode(f.read(), final=True)
+            match = FRONTMATTER_RE.match(_universal_newlines(text))
+    if match is None:
+        return None
+    return parse_frontmatter(match.group(1))
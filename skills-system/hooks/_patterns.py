@@ -0,0 +1,10 @@
+"""Compiled patterns shared by the skill hooks."""
+
+import re
+
+# Step file path, e.g. a Read tool file_path (anchored at end)
+STEP_PATTERN = re.compile(r"/skills/([^/]+)/steps/([^/]+)\.md$")
+# Step file reference anywhere in free text, e.g. a Task prompt
+STEP_REF_PATTERN = re.compile(r"/skills/([^/]+)/steps/([^/]+)\.md")
+# Leading ---\n...\n--- frontmatter block; group 1 is the YAML body
+FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
@@ -13,7 +13,6 @@ queries life.db directly for span state.
 
 from __future__ import annotations
 
-import json
 import logging
 import re
 import sys
@@ -26,10 +25,11 @@ _project_root = str(Path(__file__).resolve().parent.parent.parent.parent)
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
-from db.connection import open_db
+from db.connection import shared_db
 from db.event import emit_event
+from db.span import append_step
+from hooks._patterns import STEP_PATTERN
 
-STEP_PATTERN = re.compile(r"/skills/([^/]+)/steps/([^/]+)\.md$")
 SKILL_PATTERN = re.compile(r"/skills/([^/]+)/SKILL\.md$")
 
 
@@ -42,8 +42,8 @@ def _get_or_create_span(
     All queries scoped by session_id to prevent cross-session interference.
     """
     try:
-        with open_db() as db:
-            db.execute("BEGIN EXCLUSIVE")
+        with shared_db() as db:
+            db.execute("BEGIN IMMEDIATE")
 
             # Build session filter — nullable for backcompat with old spans
             if session_id:
@@ -53,28 +53,32 @@ def _get_or_create_span(
                 session_filter = ""
                 session_params = ()
 
-            # Branch 1: Active span for this skill in this session — append step
-            row = db.execute(
-                "SELECT span_id, steps FROM skill_span "
+            # Branch 1: Active span for this skill in this session — append step.
+            # Lookup and last_step update are one UPDATE ... RETURNING; the step
+            # itself is a single INSERT into skill_span_steps.
+            active_span = (
+                "SELECT span_id FROM skill_span "
                 "WHERE skill = ? AND status = 'active'" + session_filter + " "
-                "ORDER BY started_at DESC LIMIT 1",
-                (skill,) + session_params,
-            ).fetchone()
+                "ORDER BY started_at DESC LIMIT 1"
+            )
+            if step:
+                row = db.execute(
+                    "UPDATE skill_span SET last_step = ? "
+                    "WHERE span_id = (" + active_span + ") RETURNING span_id",
+                    (step, skill) + session_params,
+                ).fetchone()
+            else:
+                row = db.execute(active_span, (skill,) + session_params).fetchone()
             if row:
                 span_id = row["span_id"]
                 if step:
-                    steps = json.loads(row["steps"])
-                    steps.append(step)
-                    db.execute(
-                        "UPDATE skill_span SET last_step = ?, steps = ? WHERE span_id = ?",
-                        (step, json.dumps(steps), span_id),
-                    )
+                    append_step(db, span_id, step)
                 db.commit()
                 return span_id
 
             # Branch 2: Suspended span for this skill in this session — resume
             row = db.execute(
-                "SELECT span_id, steps FROM skill_span "
+                "SELECT span_id FROM skill_span "
                 "WHERE skill = ? AND status = 'suspended'"
                 + session_filter + " "
                 "ORDER BY started_at DESC LIMIT 1",
@@ -82,14 +86,13 @@ def _get_or_create_span(
             ).fetchone()
             if row:
                 span_id = row["span_id"]
-                steps = json.loads(row["steps"])
-                if step:
-                    steps.append(step)
                 db.execute(
                     "UPDATE skill_span SET status = 'active', suspended_at = NULL, "
-                    "last_step = ?, steps = ? WHERE span_id = ?",
-                    (step or steps[-1], json.dumps(steps), span_id),
+                    "last_step = COALESCE(?, last_step) WHERE span_id = ?",
+                    (step, span_id),
                 )
+                if step:
+                    append_step(db, span_id, step)
                 db.commit()
                 return span_id
 
@@ -107,11 +110,11 @@ def _get_or_create_span(
             first_step = step or "SKILL"
             db.execute(
                 "INSERT INTO skill_span (span_id, skill, parent_span_id, status, "
-                "first_step, last_step, steps, session_id) "
-                "VALUES (?, ?, ?, 'active', ?, ?, ?, ?)",
-                (span_id, skill, parent_span_id, first_step, first_step,
-                 json.dumps([first_step]), session_id),
+                "first_step, last_step, session_id) "
+                "VALUES (?, ?, ?, 'active', ?, ?, ?)",
+                (span_id, skill, parent_span_id, first_step, first_step, session_id),
             )
+            append_step(db, span_id, first_step)
             db.commit()
             return span_id
 
@@ -123,7 +126,7 @@ def _get_or_create_span(
 def _suspend_current_span(skill: str, session_id: str | None = None) -> None:
     """Suspend all active spans for a skill in this session."""
     try:
-        with open_db() as db:
+        with shared_db() as db:
             if session_id:
                 db.execute(
                     "UPDATE skill_span SET status = 'suspended', "
@@ -173,7 +176,7 @@ def log_step_enter(ctx: dict) -> dict | None:
 
     try:
         # Detect skill switch — find active span for a different skill in THIS session
-        with open_db() as db:
+        with shared_db() as db:
             if session_id:
                 prev_row = db.execute(
                     "SELECT skill, span_id FROM skill_span "
@@ -209,7 +212,7 @@ def log_step_enter(ctx: dict) -> dict | None:
         # Context injection
         parts = []
 
-        with open_db() as db:
+        with shared_db() as db:
             row = db.execute(
                 "SELECT COUNT(*) as cnt FROM life_event "
                 "WHERE skill = ? AND phase = ? AND event_type = 'step_enter'",
@@ -9,6 +9,7 @@ to the skill's pending-queue.md file.
 import json
 import logging
 import os
+import re
 import sys
 from datetime import UTC, datetime
 from pathlib import Path
@@ -27,9 +28,29 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# API key -> OpenAI client (see _get_client)
+_clients: dict = {}
+
 MODEL = "openai/gpt-5.2-high"
 BASE_URL = "https://openrouter.ai/api/v1"
 
+# Cap on knowledge-web bytes sent per flush. The web grows by appending, so the
+# tail holds the most recent entries — the ones a new extraction would duplicate.
+WEB_MAX_BYTES = 48_000
+
+# Transcript segment bounds (chars). Below the floor there is nothing worth
+# extracting; above the ceiling only the most recent tail is sent, keeping
+# token cost and provider context usage bounded on pathological transcripts.
+MIN_SEGMENT = 200
+MAX_SEGMENT = 200_000
+
+# The extraction only keeps moments the user confirmed. A segment with none of
+# these tokens cannot yield anything, so it never reaches the LLM.
+CONFIRM_RE = re.compile(
+    r"\b(yes|got it|makes sense|right|ok(ay)?|exactly|i see)\b",
+    re.IGNORECASE,
+)
+
 QUEUE_SKILLS = {
     "learning-companion": {
         "path": Path.home() / "life" / "learning" / "pending-queue.md",
@@ -48,20 +69,17 @@ QUEUE_SKILLS = {
     },
 }
 
+# Static instructions come first and the large, slow-changing knowledge web
+# precedes the queue, so consecutive flushes share the longest possible prompt
+# prefix (OpenRouter passes it through to provider-side prefix caching).
 EXTRACTION_PROMPT = """\
 You are a dedup-aware safety net for a {skill} session. Claude was supposed to
 log learning moments to a queue file but may have missed some during compaction.
 
-ALREADY QUEUED (do NOT re-extract these):
-{existing_queue}
-
-ALREADY IN KNOWLEDGE WEB (do NOT re-extract these):
-{existing_web}
-
 RULES:
 1. Only extract moments the user CONFIRMED understanding of (said "yes", "got it",
    "makes sense", asked a follow-up showing comprehension — not just listened).
-2. Skip anything already covered by ALREADY QUEUED or ALREADY IN KNOWLEDGE WEB above.
+2. Skip anything already covered by ALREADY IN KNOWLEDGE WEB or ALREADY QUEUED below.
    Same insight reworded = duplicate. Same node/edge pair = duplicate.
 3. Skip: small talk, clarifying questions, tool usage, setup, captures to study queue.
 4. Output NOTHING if no genuinely new confirmed moments. Prefer silence over duplication.
@@ -73,7 +91,57 @@ For each NEW confirmed moment, output exactly:
 {{{{one-line context}}}}
 {arrows}
 
-No preamble, no explanation, no commentary."""
+No preamble, no explanation, no commentary.
+
+ALREADY IN KNOWLEDGE WEB (do NOT re-extract these):
+{existing_web}
+
+ALREADY QUEUED (do NOT re-extract these):
+{existing_queue}"""
+
+
+def _read_or(path: Path, default: str) -> str:
+    """Read a text file, or return default if it doesn't exist (one open, no stat)."""
+    try:
+        return path.read_text()
+    except FileNotFoundError:
+        return default
+
+
+def _read_tail(path: Path, max_bytes: int) -> str:
+    """Read at most the last max_bytes of a file, starting at a line boundary."""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size <= max_bytes:
+            f.seek(0)
+            return f.read().decode("utf-8", "replace")
+        f.seek(size - max_bytes)
+        data = f.read()
+    # Drop the partial first line
+    return data[data.find(b"\n") + 1 :].decode("utf-8", "replace")
+
+
+def _get_client(api_key: str):
+    """Return an OpenRouter client, reused per API key within this process.
+
+    openai (and httpx/pydantic under it) is imported only here, after every
+    early return, so no-op flushes never pay its import cost. Reusing the
+    client keeps its HTTP connection pool alive across flushes.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        from openai import OpenAI
+
+        client = OpenAI(
+            api_key=api_key,
+            base_url=BASE_URL,
+            default_headers={
+                "HTTP-Referer": "https://github.com/anthropics/claude-code",
+                "X-Title": "Claude Code Hooks",
+            },
+        )
+        _clients[api_key] = client
+    return client
 
 
 def skill_queue_flush(ctx: dict) -> None:
@@ -82,7 +150,7 @@ def skill_queue_flush(ctx: dict) -> None:
         return
 
     # Guard: skip workers
-    if Path(".task/id").exists():
+    if os.path.lexists(".task/id"):
         return
 
     api_key = os.getenv("OPENROUTER_API_KEY")
@@ -125,29 +193,27 @@ def skill_queue_flush(ctx: dict) -> None:
     # Extract transcript segment since last compaction
     start_line = find_last_compaction_line(transcript_path)
     segment = handoff_transcript(transcript_path, start_line=start_line)
-    if len(segment) < 200:
+    if len(segment) < MIN_SEGMENT:
+        return
+    if len(segment) > MAX_SEGMENT:
+        segment = segment[-MAX_SEGMENT:]
+    if not CONFIRM_RE.search(segment):
         return
 
     # Load existing context for dedup
     queue_path = info["path"]
-    existing_queue = queue_path.read_text().strip() if queue_path.exists() else "(empty)"
+    existing_queue = _read_or(queue_path, "(empty)").strip()
     web_path = info.get("web")
     existing_web = "(none)"
-    if web_path and web_path.exists():
-        existing_web = web_path.read_text().strip()
+    if web_path:
+        try:
+            existing_web = _read_tail(web_path, WEB_MAX_BYTES).strip()
+        except FileNotFoundError:
+            pass
 
     # Call LLM to extract observations
     try:
-        from openai import OpenAI
-
-        client = OpenAI(
-            api_key=api_key,
-            base_url=BASE_URL,
-            default_headers={
-                "HTTP-Referer": "https://github.com/anthropics/claude-code",
-                "X-Title": "Claude Code Hooks",
-            },
-        )
+        client = _get_client(api_key)
 
         prompt = EXTRACTION_PROMPT.format(
             skill=skill,
@@ -179,7 +245,7 @@ def skill_queue_flush(ctx: dict) -> None:
     # Append to pending-queue
     queue_path.parent.mkdir(parents=True, exist_ok=True)
 
-    current = queue_path.read_text() if queue_path.exists() else ""
+    current = _read_or(queue_path, "")
     separator = "\n" if current and not current.endswith("\n") else ""
     queue_path.write_text(current + separator + extracted.strip() + "\n")
 
@@ -9,10 +9,9 @@ Also writes skill_todos.json marker for TodoWrite validation.
 
 import json
 import logging
-import re
 from pathlib import Path
 
-import yaml
+from hooks._frontmatter import read_frontmatter
 
 logger = logging.getLogger(__name__)
 
@@ -40,19 +39,45 @@ SKILL_PATHS = [
     Path.home() / "claude-code" / "skills",
 ]
 
+# SKILL.md path -> (st_mtime_ns, frontmatter or None if unparseable)
+_frontmatter_cache: dict[Path, tuple[int, dict | None]] = {}
+# skill -> SKILL_PATHS entry its frontmatter was last found under
+_skill_base_cache: dict[str, Path] = {}
+
+
+def _cached_frontmatter(skill_file: Path) -> dict | None:
+    """Frontmatter for one SKILL.md, revalidated by mtime. None if absent/invalid."""
+    try:
+        mtime_ns = skill_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _frontmatter_cache.get(skill_file)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    frontmatter = read_frontmatter(skill_file)
+    _frontmatter_cache[skill_file] = (mtime_ns, frontmatter)
+    return frontmatter
+
 
 def _read_skill_frontmatter(skill: str) -> dict:
-    """Read YAML frontmatter from skill's SKILL.md file."""
+    """Read YAML frontmatter from skill's SKILL.md file.
+
+    Cached per file and revalidated by mtime; the SKILL_PATHS entry that
+    hosts the skill is remembered, so repeat calls cost a single stat.
+    """
+    base = _skill_base_cache.get(skill)
+    if base is not None:
+        frontmatter = _cached_frontmatter(base / skill / "SKILL.md")
+        if frontmatter is not None:
+            return frontmatter
+        del _skill_base_cache[skill]  # moved or broken — rescan
+
     for base in SKILL_PATHS:
-        skill_file = base / skill / "SKILL.md"
-        if skill_file.exists():
-            content = skill_file.read_text()
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if match:
-                try:
-                    return yaml.safe_load(match.group(1)) or {}
-                except yaml.YAMLError:
-                    pass
+        frontmatter = _cached_frontmatter(base / skill / "SKILL.md")
+        if frontmatter is not None:
+            _skill_base_cache[skill] = base
+            return frontmatter
     return {}
 
 
@@ -68,6 +93,20 @@ def _write_skill_todos_marker(
     marker = project_dir / "skill_todos.json"
     validated_marker = project_dir / "skill_validated"
 
+    # Same skill re-invoked in the same session: keep the marker (and any
+    # validation already earned) instead of forcing re-validation.
+    try:
+        existing = json.loads(marker.read_text())
+        if (
+            existing.get("skill") == skill
+            and existing.get("required_todos") == required_todos
+            and existing.get("session_id") == session_id
+        ):
+            logger.debug("skill_todos marker unchanged: skill=%s", skill)
+            return
+    except (OSError, ValueError, AttributeError):
+        pass  # Missing or unreadable marker - rewrite it
+
     # Remove old validated marker (fresh start for new skill invocation)
     if validated_marker.exists():
         validated_marker.unlink()
@@ -11,54 +11,89 @@ Separate from worker validation (todowrite_validator.py) - only fires when:
 
 import json
 import logging
+import os
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+_PROJECTS_DIR = Path.home() / "projects"
+_PROJECTS_PREFIX = str(_PROJECTS_DIR) + os.sep
 
-def _is_worker(ctx: dict) -> bool:
-    """Check if we're in a worker context (.task/ dir exists)."""
-    cwd = ctx.get("cwd")
-    if not cwd:
-        return False
-    task_dir = Path(cwd) / ".task"
-    return (task_dir / "id").is_file()
+# marker path -> (st_mtime_ns, skill, [(step, lowercased words)])
+_marker_cache: dict[Path, tuple[int, str, list[tuple[str, tuple[str, ...]]]]] = {}
 
 
-def _find_planning_dir(ctx: dict) -> Path | None:
-    """Find .planning/ dir from cwd or projects directory."""
-    cwd = ctx.get("cwd")
-    if not cwd:
-        return None
+def _scan_cwd(cwd: str) -> tuple[bool, Path | None]:
+    """One listing of cwd answers both gates.
 
-    # Check cwd/.planning/
-    planning_dir = Path(cwd) / ".planning"
-    if planning_dir.exists():
-        return planning_dir
-
-    # Check if cwd is under ~/projects/{project}/
-    cwd_path = Path(cwd)
-    projects_dir = Path.home() / "projects"
+    Returns:
+        (is_worker, planning_dir): whether cwd/.task/id exists, and
+        cwd/.planning/ if present.
+    """
+    is_worker = False
+    planning_dir = None
     try:
-        relative = cwd_path.relative_to(projects_dir)
-        project = relative.parts[0] if relative.parts else None
-        if project:
-            planning_dir = projects_dir / project / ".planning"
-            if planning_dir.exists():
-                return planning_dir
-    except ValueError:
-        pass  # cwd not under ~/projects/
+        with os.scandir(cwd) as entries:
+            for entry in entries:
+                if entry.name == ".task":
+                    is_worker = entry.is_dir() and os.path.isfile(os.path.join(entry.path, "id"))
+                elif entry.name == ".planning":
+                    planning_dir = Path(entry.path)
+    except OSError:
+        return False, None
+    return is_worker, planning_dir
+
+
+def _find_project_planning_dir(cwd: str) -> Path | None:
+    """Find .planning/ of the ~/projects/{project}/ containing cwd."""
+    # String prefix, no Path walk; normpath first so `//` or `.` segments
+    # don't hide the project name
+    cwd = os.path.normpath(cwd)
+    if not cwd.startswith(_PROJECTS_PREFIX):
+        return None
+    project, _, rest = cwd[len(_PROJECTS_PREFIX) :].partition(os.sep)
+    # cwd is the project root itself: already covered by _scan_cwd
+    if not project or not rest.strip(os.sep):
+        return None
+    planning_dir = _PROJECTS_DIR / project / ".planning"
+    return planning_dir if planning_dir.exists() else None
 
-    return None
 
+def _load_required(marker: Path) -> tuple[str, list[tuple[str, tuple[str, ...]]]] | None:
+    """Load (skill, required steps with their words) from the marker.
+
+    Parsed once per marker mtime, so TodoWrite retries against the same
+    marker skip the JSON parse and per-step word splitting.
 
-def _step_present(todos: list[dict], step: str) -> bool:
+    Raises:
+        OSError: marker missing or unreadable.
+        json.JSONDecodeError: marker is not valid JSON.
+    """
+    mtime = marker.stat().st_mtime_ns
+    cached = _marker_cache.get(marker)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    data = json.loads(marker.read_text())
+    skill = data.get("skill", "unknown")
+    required = [
+        (step, tuple(dict.fromkeys(step.lower().split())))
+        for step in data.get("required_todos", [])
+    ]
+    _marker_cache[marker] = (mtime, skill, required)
+    return skill, required
+
+
+def _step_present(todo_texts: list[str], words: tuple[str, ...]) -> bool:
     """Check if any todo contains all words from the step name.
 
     Fuzzy match: "Codebase context" matches "Gather codebase context using MCP"
+
+    Args:
+        todo_texts: Todo contents, already lowercased (once per check, not per step).
+        words: Lowercased, de-duplicated words of the step name.
     """
-    words = step.lower().split()
-    return any(all(w in t.get("content", "").lower() for w in words) for t in todos)
+    return any(all(w in text for w in words) for text in todo_texts)
 
 
 def check(ctx: dict) -> dict | None:
@@ -70,12 +105,18 @@ def check(ctx: dict) -> dict | None:
     if ctx.get("tool_name") != "TodoWrite":
         return None
 
+    cwd = ctx.get("cwd")
+    if not cwd:
+        return None
+
     # Skip workers (handled by todowrite_validator.py)
-    if _is_worker(ctx):
+    is_worker, planning_dir = _scan_cwd(cwd)
+    if is_worker:
         return None
 
-    # Find .planning/ directory
-    planning_dir = _find_planning_dir(ctx)
+    # Find .planning/ directory (cwd first, then the enclosing project)
+    if planning_dir is None:
+        planning_dir = _find_project_planning_dir(cwd)
     if not planning_dir:
         return None
 
@@ -91,9 +132,7 @@ def check(ctx: dict) -> dict | None:
 
     # Load required todos
     try:
-        data = json.loads(marker.read_text())
-        skill = data.get("skill", "unknown")
-        required = data.get("required_todos", [])
+        skill, required = _load_required(marker)
     except (json.JSONDecodeError, OSError) as e:
         logger.debug("Failed to read skill_todos.json: %s", e)
         return None
@@ -103,7 +142,8 @@ def check(ctx: dict) -> dict | None:
 
     # Validate todos
     todos = ctx.get("tool_input", {}).get("todos", [])
-    missing = [step for step in required if not _step_present(todos, step)]
+    todo_texts = [t.get("content", "").lower() for t in todos]
+    missing = [step for step, words in required if not _step_present(todo_texts, words)]
 
     if missing:
         return {
@@ -5,81 +5,179 @@ checks that all consumed artifacts have been produced by previously-visited step
 
 Uses:
 - Step file frontmatter (consumes/produces) to build dependency graph
-- skill_span.steps from life.db to check which steps have been visited
+- skill_span_steps from life.db to check which steps have been visited
+
+The active-span lookup relies on the idx_skill_span_active partial index
+created by db.connection.
 """
 
-import json
 import logging
-import re
+import os
 import sys
+from collections.abc import Iterable
 from pathlib import Path
 
-import yaml
-
 logger = logging.getLogger(__name__)
 
-STEP_PATTERN = re.compile(r"/skills/([^/]+)/steps/([^/]+)\.md$")
-
 # Module-level cache: skill_name -> {artifact: step_name}
 _produces_map: dict[str, dict[str, str]] = {}
 # Module-level cache: skill_name -> {step_name: [consumed_artifacts]}
 _consumes_map: dict[str, dict[str, list[str]]] = {}
 # Module-level cache: skill_name -> set of optional step names
-_optional_steps: dict[str, set[str]] = {}
+_optional_steps: dict[str, frozenset[str]] = {}
+# Module-level cache: skill_name -> steps the gate can never block
+_no_dep_steps: dict[str, frozenset[str]] = {}
+# Module-level cache: skill_name -> steps dir st_mtime_ns the maps were built at
+_dir_mtimes: dict[str, int | None] = {}
 
 _SKILLS_DIR = Path.home() / ".claude" / "skills"
+# Persisted contracts, one per skill dir (see _build_contracts)
+_CACHE_FILE = ".steps.cache.json"
+# Bump when the cached layout changes; older files are treated as misses
+_CACHE_VERSION = 1
 
 # Root inputs always satisfied — not produced by any step
-ROOT_INPUTS = {"user-request"}
+ROOT_INPUTS = frozenset({"user-request"})
+
+_EMPTY: frozenset[str] = frozenset()
 
 _project_root = str(Path(__file__).resolve().parent.parent.parent.parent)
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
-from db.connection import open_db
+# db.* and the frontmatter parser are imported where used: most Reads are
+# not step files and return before needing sqlite3 or a JSON backend.
+from hooks._patterns import STEP_PATTERN
 
 
-def _build_contracts(skill: str) -> None:
-    """Parse all step files and build produces/consumes maps for a skill."""
-    if skill in _produces_map:
-        return
+def _step_mtimes(steps_dir: Path) -> dict[str, int]:
+    """Step file name -> st_mtime_ns for every *.md file in steps_dir."""
+    with os.scandir(steps_dir) as entries:
+        return {
+            e.name: e.stat().st_mtime_ns
+            for e in entries
+            if e.name.endswith(".md") and e.is_file()
+        }
+
+
+def _parse_contracts(steps_dir: Path, names: Iterable[str]) -> dict:
+    """Parse step file frontmatter into produces/consumes/optional."""
+    from hooks._frontmatter import read_frontmatter
 
     produces: dict[str, str] = {}
     consumes: dict[str, list[str]] = {}
-    optional: set[str] = set()
-
-    steps_dir = _SKILLS_DIR / skill / "steps"
-    if not steps_dir.is_dir():
-        _produces_map[skill] = produces
-        _consumes_map[skill] = consumes
-        _optional_steps[skill] = optional
-        return
+    optional: list[str] = []
 
-    for step_file in steps_dir.glob("*.md"):
-        step_name = step_file.stem
+    for name in names:
+        step_name = name[:-3]
         try:
-            content = step_file.read_text()
+            fm = read_frontmatter(steps_dir / name)
         except OSError:
             continue
-
-        match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-        if not match:
-            continue
-
-        try:
-            fm = yaml.safe_load(match.group(1)) or {}
-        except yaml.YAMLError:
+        if fm is None:
             continue
 
         for artifact in fm.get("produces", []):
             produces[artifact] = step_name
         consumes[step_name] = fm.get("consumes", [])
         if fm.get("optional"):
-            optional.add(step_name)
+            optional.append(step_name)
+
+    # Steps whose every consumed artifact is a root input, has no producer in
+    # this skill, or comes from an optional step: never blocked, whatever
+    # has been visited, so check() can allow them without a DB lookup
+    no_dep_steps = [
+        step_name
+        for step_name, artifacts in consumes.items()
+        if all(
+            a in ROOT_INPUTS or produces.get(a) in (None, *optional)
+            for a in artifacts or ()
+        )
+    ]
+
+    return {
+        "version": _CACHE_VERSION,
+        "produces": produces,
+        "consumes": consumes,
+        "optional": optional,
+        "no_dep_steps": no_dep_steps,
+    }
+
+
+def _load_cached_contracts(cache_path: Path, mtimes: dict[str, int]) -> dict | None:
+    """Return the on-disk contracts if they were built from these exact files."""
+    from db import fastjson
+
+    try:
+        data = fastjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != _CACHE_VERSION
+        or data.get("files") != mtimes
+    ):
+        return None
+    return data
+
+
+def _save_cached_contracts(cache_path: Path, data: dict) -> None:
+    """Atomically write contracts next to the steps dir. Best-effort."""
+    from db import fastjson
+
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(fastjson.dumps(data))
+        os.replace(tmp, cache_path)
+    # TypeError/ValueError: frontmatter JSON can't hold (e.g. `produces: [1]`
+    # gives a non-str key) — skip the cache, the in-memory maps still work
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("step_gate: failed to write contracts cache: %s", e)
+        tmp.unlink(missing_ok=True)
+
+
+def _build_contracts(skill: str) -> None:
+    """Build produces/consumes maps for a skill.
+
+    Hooks run as short-lived processes, so parsed contracts are also persisted
+    to <skill>/.steps.cache.json, keyed by every step file's mtime. A warm call
+    costs one scandir plus one small JSON read instead of parsing each step.
+
+    Within a process the maps are reused while the steps dir mtime is
+    unchanged (one stat per call); adding, removing or renaming a step file
+    triggers a rebuild.
+    """
+    steps_dir = _SKILLS_DIR / skill / "steps"
+    try:
+        dir_mtime = os.stat(steps_dir).st_mtime_ns
+    except OSError:
+        dir_mtime = None
+    if skill in _produces_map and _dir_mtimes[skill] == dir_mtime:
+        return
+    _dir_mtimes[skill] = dir_mtime
+
+    try:
+        mtimes = _step_mtimes(steps_dir) if dir_mtime is not None else None
+    except OSError:
+        mtimes = None
+    if mtimes is None:
+        _produces_map[skill] = {}
+        _consumes_map[skill] = {}
+        _optional_steps[skill] = _EMPTY
+        _no_dep_steps[skill] = _EMPTY
+        return
+
+    cache_path = steps_dir.parent / _CACHE_FILE
+    data = _load_cached_contracts(cache_path, mtimes)
+    if data is None:
+        data = _parse_contracts(steps_dir, mtimes)
+        data["files"] = mtimes
+        _save_cached_contracts(cache_path, data)
 
-    _produces_map[skill] = produces
-    _consumes_map[skill] = consumes
-    _optional_steps[skill] = optional
+    _produces_map[skill] = data["produces"]
+    _consumes_map[skill] = data["consumes"]
+    _optional_steps[skill] = frozenset(data["optional"])
+    _no_dep_steps[skill] = frozenset(data["no_dep_steps"])
 
 
 def _get_span_steps(skill: str, session_id: str | None = None) -> list[str] | None:
@@ -88,26 +186,36 @@ def _get_span_steps(skill: str, session_id: str | None = None) -> list[str] | No
     Returns None if no active span exists (editing, browsing — not invoking).
     The caller treats None as "allow" — gate only enforces during active sessions.
     """
+    from db.connection import shared_db
+
+    if session_id:
+        active_span = (
+            "SELECT span_id FROM skill_span "
+            "WHERE skill = ? AND status = 'active' AND session_id = ? "
+            "ORDER BY started_at DESC LIMIT 1"
+        )
+        params = (skill, session_id)
+    else:
+        active_span = (
+            "SELECT span_id FROM skill_span "
+            "WHERE skill = ? AND status = 'active' "
+            "ORDER BY started_at DESC LIMIT 1"
+        )
+        params = (skill,)
+
     try:
-        with open_db() as db:
-            if session_id:
-                row = db.execute(
-                    "SELECT steps FROM skill_span "
-                    "WHERE skill = ? AND status = 'active' AND session_id = ? "
-                    "ORDER BY started_at DESC LIMIT 1",
-                    (skill, session_id),
-                ).fetchone()
-            else:
-                row = db.execute(
-                    "SELECT steps FROM skill_span "
-                    "WHERE skill = ? AND status = 'active' "
-                    "ORDER BY started_at DESC LIMIT 1",
-                    (skill,),
-                ).fetchone()
-
-            if not row:
-                return None  # No active span — not invoking this skill
-            return json.loads(row["steps"]) if row["steps"] else []
+        with shared_db() as db:
+            # One row per visited step; a span with no steps yields a single
+            # NULL-step row, no active span yields no rows
+            rows = db.execute(
+                "SELECT st.step FROM (" + active_span + ") s "
+                "LEFT JOIN skill_span_steps st ON st.span_id = s.span_id "
+                "ORDER BY st.pos",
+                params,
+            ).fetchall()
+        if not rows:
+            return None  # No active span — not invoking this skill
+        return [r["step"] for r in rows if r["step"] is not None]
     except Exception as e:
         logger.debug("step_gate: failed to get visited steps: %s", e)
         return None
@@ -123,6 +231,9 @@ def check(ctx: dict) -> dict | None:
         return None
 
     file_path = ctx.get("tool_input", {}).get("file_path", "")
+    # Most Reads aren't step files: literal checks before the regex
+    if "/steps/" not in file_path or "/skills/" not in file_path:
+        return None
     match = STEP_PATTERN.search(file_path)
     if not match:
         return None
@@ -136,32 +247,36 @@ def check(ctx: dict) -> dict | None:
     # Build dependency graph
     _build_contracts(skill)
 
-    # Get this step's consumes
-    step_consumes = _consumes_map.get(skill, {}).get(step, [])
-    if not step_consumes:
-        return None  # No frontmatter or no consumes — allow
-
-    # All root inputs? Always allow
-    if all(c in ROOT_INPUTS for c in step_consumes):
+    # Precomputed: nothing this step consumes can be missing — skip the DB
+    if step in _no_dep_steps[skill]:
         return None
 
+    # Single pass over consumes: keep only artifacts that could still block
+    # (not a root input, produced in this skill by a non-optional step)
+    produces_map = _produces_map[skill]
+    optional = _optional_steps.get(skill, _EMPTY)
+    pending = []
+    for artifact in _consumes_map[skill].get(step, ()):
+        if artifact in ROOT_INPUTS:
+            continue
+        producer = produces_map.get(artifact)
+        if producer and producer not in optional:
+            pending.append((artifact, producer))
+    if not pending:
+        return None  # No frontmatter, no consumes, or nothing blockable — allow
+
     # Check which steps have been visited (scoped to this session)
     session_id = ctx.get("session_id")
     visited = _get_span_steps(skill, session_id=session_id)
     if visited is None:
         return None  # DB error — fail open
-    produces_map = _produces_map.get(skill, {})
 
     # Find unsatisfied dependencies
-    missing = []
-    for artifact in step_consumes:
-        if artifact in ROOT_INPUTS:
-            continue
-        producer = produces_map.get(artifact)
-        if producer and producer not in visited:
-            if producer in _optional_steps.get(skill, set()):
-                continue  # optional step skipped — allow through
-            missing.append(f"'{artifact}' (produced by '{producer}')")
+    missing = [
+        f"'{artifact}' (produced by '{producer}')"
+        for artifact, producer in pending
+        if producer not in visited
+    ]
 
     if missing:
         return {
@@ -5,14 +5,16 @@ Fires on PreToolUse for Task tool. Scans prompt for step file references
 
 Key safety: ONLY appends to existing active spans. Never creates, never
 resumes. If no active span exists, this is a silent no-op.
+
+The active-span lookup relies on the idx_skill_span_active partial index
+created by db.connection.
 """
 
 from __future__ import annotations
 
-import json
 import logging
-import re
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -21,10 +23,58 @@ _project_root = str(Path(__file__).resolve().parent.parent.parent.parent)
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
-from db.connection import open_db
-from db.event import emit_event
-
-STEP_PATTERN = re.compile(r"/skills/([^/]+)/steps/([^/]+)\.md")
+from hooks._patterns import STEP_REF_PATTERN
+
+
+def _find_step_refs(prompt: str) -> list[tuple[str, str]]:
+    """Unique (skill, step) references in a prompt, in first-seen order.
+
+    Jumps between literal "/skills/" occurrences and only runs the regex
+    anchored at each one, so long prompts with few references stay cheap.
+    """
+    refs: dict[tuple[str, str], None] = {}
+    i = prompt.find("/skills/")
+    while i != -1:
+        m = STEP_REF_PATTERN.match(prompt, i)
+        if m:
+            refs[(m.group(1), m.group(2))] = None
+            i = prompt.find("/skills/", m.end())
+        else:
+            i = prompt.find("/skills/", i + 1)
+    return list(refs)
+
+
+def _active_span(db, skill: str, session_id: str | None):
+    """(span_id, last_step) row of the skill's active span, or None."""
+    if session_id:
+        return db.execute(
+            "SELECT span_id, last_step FROM skill_span "
+            "WHERE skill = ? AND status = 'active' AND session_id = ? "
+            "ORDER BY started_at DESC LIMIT 1",
+            (skill, session_id),
+        ).fetchone()
+    return db.execute(
+        "SELECT span_id, last_step FROM skill_span "
+        "WHERE skill = ? AND status = 'active' "
+        "ORDER BY started_at DESC LIMIT 1",
+        (skill,),
+    ).fetchone()
+
+
+def _nothing_to_append(db, by_skill: dict[str, list[str]], session_id: str | None) -> bool:
+    """Lock-free check that every referenced step is already its span's tail.
+
+    Retried or follow-up Task calls usually re-reference the step a span
+    already ends on. Refs are unique per skill, so two or more steps for a
+    skill always append something and skip the read.
+    """
+    for skill, steps in by_skill.items():
+        if len(steps) != 1:
+            return False
+        row = _active_span(db, skill, session_id)
+        if row and row["last_step"] != steps[0]:
+            return False
+    return True
 
 
 def check(ctx: dict) -> dict | None:
@@ -36,48 +86,58 @@ def check(ctx: dict) -> dict | None:
     if not prompt:
         return None
 
-    matches = STEP_PATTERN.findall(prompt)
+    matches = _find_step_refs(prompt)
     # Filter internal skills before touching DB
     matches = [(skill, step) for skill, step in matches if not skill.startswith("_")]
     if not matches:
         return None
 
+    # Group steps per skill (match order preserved) so each span is read and
+    # written once, all under a single write transaction
+    by_skill: dict[str, list[str]] = defaultdict(list)
+    for skill, step in matches:
+        by_skill[skill].append(step)
+
+    # Deferred until a Task actually references steps: most Task calls don't,
+    # and sqlite3 is the bulk of this hook's import cost
+    from db.connection import shared_db
+    from db.event import emit_event
+    from db.span import append_step
+
     session_id = ctx.get("session_id")
+    delegated: list[tuple[str, str]] = []
 
     try:
-        with open_db() as db:
-            for skill, step in matches:
-                db.execute("BEGIN EXCLUSIVE")
-                if session_id:
-                    row = db.execute(
-                        "SELECT span_id, steps FROM skill_span "
-                        "WHERE skill = ? AND status = 'active' AND session_id = ? "
-                        "ORDER BY started_at DESC LIMIT 1",
-                        (skill, session_id),
-                    ).fetchone()
-                else:
-                    row = db.execute(
-                        "SELECT span_id, steps FROM skill_span "
-                        "WHERE skill = ? AND status = 'active' "
-                        "ORDER BY started_at DESC LIMIT 1",
-                        (skill,),
-                    ).fetchone()
-
-                wrote = False
-                if row:
-                    span_id = row["span_id"]
-                    steps = json.loads(row["steps"])
-                    if not (steps and steps[-1] == step):
-                        steps.append(step)
-                        db.execute(
-                            "UPDATE skill_span SET last_step = ?, steps = ? WHERE span_id = ?",
-                            (step, json.dumps(steps), span_id),
-                        )
-                        wrote = True
-                db.commit()
-
-                if wrote:
-                    emit_event(skill, step, event_type="subagent_step_delegate")
+        with shared_db() as db:
+            if _nothing_to_append(db, by_skill, session_id):
+                return None
+
+            # IMMEDIATE: serializes writers; WAL readers (step_gate) are not blocked.
+            # Spans are re-read under the lock — the pre-check was unlocked.
+            db.execute("BEGIN IMMEDIATE")
+            for skill, new_steps in by_skill.items():
+                row = _active_span(db, skill, session_id)
+                if not row:
+                    continue
+
+                # last_step is always the tail of the span's steps
+                last = row["last_step"]
+                appended = []
+                for step in new_steps:
+                    if step != last:
+                        append_step(db, row["span_id"], step)
+                        appended.append(step)
+                        last = step
+                if appended:
+                    db.execute(
+                        "UPDATE skill_span SET last_step = ? WHERE span_id = ?",
+                        (last, row["span_id"]),
+                    )
+                    delegated.extend((skill, step) for step in appended)
+            db.commit()
+
+        for skill, step in delegated:
+            emit_event(skill, step, event_type="subagent_step_delegate")
 
     except Exception as e:
         logger.debug("subagent_step_tracker: failed (non-blocking): %s", e)
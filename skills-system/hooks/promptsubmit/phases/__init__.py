@@ -11,8 +11,8 @@ from hooks.promptsubmit.phases import (
     skill_run_initializer,
 )
 
-# Ordered list of phase check functions
-# skill_run_initializer first so SkillRun is created before skill loads
+# Phase check functions. The runner runs them concurrently; list order is
+# the order their contexts are joined in (first systemMessage wins).
 # skill_queue_reminder last — fires every turn during active skill sessions
 PHASES = [
     skill_run_initializer.check,
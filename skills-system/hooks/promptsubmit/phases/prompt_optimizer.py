@@ -10,12 +10,15 @@ Patterns supported:
 
 from __future__ import annotations
 
+import os
 import re
 from pathlib import Path
 
 # === SKILL LOCATIONS ===
 SKILLS_DIR = Path.home() / ".claude/skills"
 EXEC_OPT_PATH = SKILLS_DIR / "exec-opt/SKILL.md"
+# String prefix for per-skill paths on the hot path (cheaper than Path joins)
+SKILLS_DIR_STR = str(SKILLS_DIR) + os.sep
 
 # === ACTION MODE DEFINITIONS ===
 # Maps mode key to (trigger_pattern, skill_name, is_deep)
@@ -51,12 +54,32 @@ CONTEXT_PATTERNS = {
     for key, (pattern, _) in CONTEXT_MODES.items()
 }
 
+# Every action + context hashtag in one alternation: a single scan finds all
+# modes present (the named group is the mode key) and a single sub strips them
+MODE_HASHTAGS_PATTERN = re.compile(
+    r"\s*(?:"
+    + "|".join(
+        rf"(?P<{key}>{pattern})"
+        for key, (pattern, *_) in (ACTION_MODES | CONTEXT_MODES).items()
+    )
+    + r")(?=\s|[?!.,;]|$)",
+    re.IGNORECASE,
+)
+
+# Hashtag token -> resolution, for tokens already isolated by
+# HASHTAG_MODE_PATTERN (plain dict lookup, no regex)
+ACTION_BY_HASHTAG = {pattern: (skill, is_deep) for pattern, skill, is_deep in ACTION_MODES.values()}
+CONTEXT_BY_HASHTAG = {pattern: skill for pattern, skill in CONTEXT_MODES.values()}
+# Context check in _extract_hashtag_modes is a prefix test ("#qlight...")
+_CONTEXT_PREFIXES = tuple(CONTEXT_BY_HASHTAG)
+
 # === EXEC-OPT COMPOSITION PATTERNS ===
 
-# /exec-opt with hashtag modes: /exec-opt #pf #vf question
-EXEC_OPT_WITH_HASHTAGS = re.compile(
-    r"^/exec-opt\s+(.+)$",
-    re.IGNORECASE | re.DOTALL,
+# One anchored match picks the exec-opt form from the character after the
+# command: whitespace → hashtag modes / multi-slash, "+" → legacy plus list
+EXEC_OPT_DISPATCH = re.compile(
+    r"/exec-opt(?:(?P<plus>\+)|(?P<args>\s))",
+    re.IGNORECASE,
 )
 
 # Extract hashtag modes from text (matches #pref, #ver, #qheavy, etc.)
@@ -81,30 +104,73 @@ MULTI_SLASH_START = re.compile(
 SKILL_NAME_PATTERN = re.compile(r"(?:^|(?<=\s))/([a-z][a-z0-9]*(?:-[a-z0-9]+)*)(?=\s|$)")
 
 
+# Module-level cache: SKILL.md path -> (st_mtime_ns, content)
+_file_cache: dict[str | Path, tuple[int, str]] = {}
+
+
+def _read_cached(path: str | Path) -> str:
+    """Read a skill file, re-reading only when its mtime changes. "" if missing.
+
+    Each file is read and decoded once per mtime; hits cost one stat and
+    return the cached str itself, so exec-opt and context skills are never
+    re-decoded per prompt.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return ""
+    cached = _file_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path) as f:
+            content = f.read()
+    except OSError:
+        return ""
+    _file_cache[path] = (mtime, content)
+    return content
+
+
 def _read_exec_opt() -> str:
     """Read exec-opt content."""
-    if EXEC_OPT_PATH.exists():
-        return EXEC_OPT_PATH.read_text()
-    return ""
+    return _read_cached(EXEC_OPT_PATH)
+
+
+def _modes_present(prompt: str) -> set[str]:
+    """Mode keys of every action/context hashtag in the prompt."""
+    return {m.lastgroup for m in MODE_HASHTAGS_PATTERN.finditer(prompt)}
+
+
+def _strip_mode_hashtags(prompt: str, *pattern_groups: dict[str, re.Pattern]) -> str:
+    """Remove all action/context hashtags and normalize whitespace.
+
+    One union sub covers normal prompts. Hashtags glued together ("#a#b")
+    can expose a new match once one is stripped; that result depends on the
+    per-pattern order, so replay pattern_groups in order for those.
+    """
+    clean = MODE_HASHTAGS_PATTERN.sub("", prompt)
+    if MODE_HASHTAGS_PATTERN.search(clean):
+        clean = prompt
+        for patterns in pattern_groups:
+            for p in patterns.values():
+                clean = p.sub("", clean)
+    return " ".join(clean.split())
 
 
 def _detect_action_mode(prompt: str) -> tuple[str | None, str, bool]:
     """Detect action mode from hashtag flags.
 
+    Modes earlier in ACTION_MODES win when several are present.
+
     Returns:
         (mode_key, clean_prompt, is_deep)
     """
-    for mode_key, pattern in ACTION_PATTERNS.items():
-        if pattern.search(prompt):
-            # Remove all hashtag patterns from prompt
-            clean = prompt
-            for p in ACTION_PATTERNS.values():
-                clean = p.sub("", clean)
-            for p in CONTEXT_PATTERNS.values():
-                clean = p.sub("", clean)
-            clean = " ".join(clean.split())
-
-            _, _, is_deep = ACTION_MODES[mode_key]
+    if "#" not in prompt:  # e.g. /exec-opt /skill prompts, or context already stripped
+        return None, prompt, False
+    present = _modes_present(prompt)
+    for mode_key, (_, _, is_deep) in ACTION_MODES.items():
+        if mode_key in present:
+            clean = _strip_mode_hashtags(prompt, ACTION_PATTERNS, CONTEXT_PATTERNS)
             return mode_key, clean, is_deep
     return None, prompt, False
 
@@ -112,19 +178,17 @@ def _detect_action_mode(prompt: str) -> tuple[str | None, str, bool]:
 def _detect_context_mode(prompt: str) -> tuple[str | None, str]:
     """Detect context mode from hashtag flags.
 
+    Modes earlier in CONTEXT_MODES win when several are present.
+
     Returns:
         (mode_key, clean_prompt)
     """
-    for mode_key, pattern in CONTEXT_PATTERNS.items():
-        if pattern.search(prompt):
-            # Remove all hashtag patterns from prompt
-            clean = prompt
-            for p in CONTEXT_PATTERNS.values():
-                clean = p.sub("", clean)
-            for p in ACTION_PATTERNS.values():
-                clean = p.sub("", clean)
-            clean = " ".join(clean.split())
-            return mode_key, clean
+    if "#" not in prompt:
+        return None, prompt
+    present = _modes_present(prompt)
+    for mode_key in CONTEXT_MODES:
+        if mode_key in present:
+            return mode_key, _strip_mode_hashtags(prompt, CONTEXT_PATTERNS, ACTION_PATTERNS)
     return None, prompt
 
 
@@ -134,25 +198,23 @@ def _extract_hashtag_modes(text: str) -> tuple[list[str], list[str], str]:
     Returns:
         (action_modes, context_modes, remaining text)
     """
-    all_hashtags = HASHTAG_MODE_PATTERN.findall(text)
-
     action_modes = []
     context_modes = []
+    kept = []  # text between hashtags, so one scan both classifies and strips
+    pos = 0
 
-    for h in all_hashtags:
-        h_lower = h.lower()
+    for m in HASHTAG_MODE_PATTERN.finditer(text):
+        h = m.group(1)
         # Check if it's a context mode
-        is_context = False
-        for _, (pattern, _) in CONTEXT_MODES.items():
-            if re.match(pattern, h_lower):
-                context_modes.append(h)
-                is_context = True
-                break
-        if not is_context:
+        if h.lower().startswith(_CONTEXT_PREFIXES):
+            context_modes.append(h)
+        else:
             action_modes.append(h)
+        kept.append(text[pos : m.start()])
+        pos = m.end()
+    kept.append(text[pos:])
 
-    clean = HASHTAG_MODE_PATTERN.sub("", text)
-    clean = " ".join(clean.split()).strip()
+    clean = " ".join("".join(kept).split())
     return action_modes, context_modes, clean
 
 
@@ -165,13 +227,7 @@ def _hashtag_to_action_skill(hashtag: str) -> tuple[str, bool] | None:
     Returns:
         (skill_name, is_deep) or None if not recognized
     """
-    h = hashtag.strip().lower()
-
-    for mode_key, pattern in ACTION_PATTERNS.items():
-        if pattern.match(h) or pattern.match(" " + h):
-            _, skill_name, is_deep = ACTION_MODES[mode_key]
-            return skill_name, is_deep
-    return None
+    return ACTION_BY_HASHTAG.get(hashtag.strip().lower())
 
 
 def _hashtag_to_context_skill(hashtag: str) -> str | None:
@@ -183,13 +239,59 @@ def _hashtag_to_context_skill(hashtag: str) -> str | None:
     Returns:
         skill_name or None if not recognized
     """
-    h = hashtag.strip().lower()
+    return CONTEXT_BY_HASHTAG.get(hashtag.strip().lower())
 
-    for mode_key, pattern in CONTEXT_PATTERNS.items():
-        if pattern.match(h) or pattern.match(" " + h):
-            _, skill_name = CONTEXT_MODES[mode_key]
-            return skill_name
-    return None
+
+# === OUTPUT TEMPLATES ===
+# Static scaffolds formatted once per prompt; only the slots vary
+
+_COMPOSE_MODES_TEMPLATE = """{base}
+
+<input>
+{question}
+</input>
+{modes}{contexts}
+<mode_config>
+deep_probe: {deep}
+</mode_config>
+"""
+
+_DEEP_INSTRUCTION = """
+**DEPTH_PROBE REQUIRED:** After invoking the skill, you MUST also call:
+```python
+mcp__reasoning-mcp__depth_probe(question="<the question>")
+```
+Incorporate probe insights into your response.
+"""
+
+_ACTIVE_CONTEXT_BLOCK = """
+<active_context skill="{skill}">
+{content}
+</active_context>
+
+**CONTEXT IS ACTIVE.** The above context modifies HOW you execute everything below.
+"""
+
+_INVOKE_SKILL_TEMPLATE = """{context_block}**MANDATORY: Invoke skill before responding.**
+
+You MUST invoke the `{skill_name}` skill IMMEDIATELY using:
+
+```python
+Skill("{skill_name}")
+```
+
+Do this BEFORE generating any other response.
+{deep_instruction}
+<user-question>
+{question}
+</user-question>"""
+
+
+def _tag_block(tag: str, lines: list[str]) -> str:
+    """Wrap lines in <tag>...</tag> preceded by a blank line, or "" if empty."""
+    if not lines:
+        return ""
+    return f"\n<{tag}>\n" + "\n".join(lines) + f"\n</{tag}>\n"
 
 
 def _compose_with_modes(
@@ -216,7 +318,7 @@ def _compose_with_modes(
         resolved = _hashtag_to_action_skill(h)
         if resolved:
             skill_name, is_deep = resolved
-            action_lines.append(f"- {skill_name}: {SKILLS_DIR / skill_name / 'SKILL.md'}")
+            action_lines.append(f"- {skill_name}: {SKILLS_DIR_STR}{skill_name}/SKILL.md")
             if is_deep:
                 has_deep = True
 
@@ -225,22 +327,16 @@ def _compose_with_modes(
     for h in context_hashtags:
         skill_name = _hashtag_to_context_skill(h)
         if skill_name:
-            context_lines.append(f"- {skill_name}: {SKILLS_DIR / skill_name / 'SKILL.md'}")
+            context_lines.append(f"- {skill_name}: {SKILLS_DIR_STR}{skill_name}/SKILL.md")
 
-    # Build output
-    result = base_content + f"\n\n<input>\n{question}\n</input>\n"
-
-    if action_lines:
-        result += f"\n<requested_modes>\n" + "\n".join(action_lines) + "\n</requested_modes>\n"
-
-    if context_lines:
-        result += (
-            f"\n<requested_contexts>\n" + "\n".join(context_lines) + "\n</requested_contexts>\n"
-        )
-
-    result += f"\n<mode_config>\ndeep_probe: {str(has_deep).lower()}\n</mode_config>\n"
-
-    return result
+    # Build output in one pass — base_content can be large, so no += chain
+    return _COMPOSE_MODES_TEMPLATE.format(
+        base=base_content,
+        question=question,
+        modes=_tag_block("requested_modes", action_lines),
+        contexts=_tag_block("requested_contexts", context_lines),
+        deep=str(has_deep).lower(),
+    )
 
 
 def _compose_multi_skill(skill_names: list[str], question: str) -> str | None:
@@ -257,7 +353,7 @@ def _compose_multi_skill(skill_names: list[str], question: str) -> str | None:
     if not base_content:
         return None
 
-    skill_lines = "\n".join(f"- {s}: {SKILLS_DIR / s / 'SKILL.md'}" for s in skill_names)
+    skill_lines = "\n".join(f"- {s}: {SKILLS_DIR_STR}{s}/SKILL.md" for s in skill_names)
 
     return f"""{base_content}
 
@@ -291,10 +387,9 @@ def _extract_multi_slash_skills(prompt: str) -> tuple[list[str], str] | None:
     if not additional_skills:
         return None
 
-    # Extract question
-    question = prompt
-    for skill in all_skills:
-        question = re.sub(rf"(?:^|(?<=\s))/{re.escape(skill)}(?=\s|$)", "", question)
+    # Extract question: drop every /skill token in one pass. The tokens are
+    # exactly SKILL_NAME_PATTERN's matches, so no per-skill pattern is needed.
+    question = SKILL_NAME_PATTERN.sub("", prompt)
     question = " ".join(question.split()).strip()
 
     return additional_skills, question
@@ -302,10 +397,7 @@ def _extract_multi_slash_skills(prompt: str) -> tuple[list[str], str] | None:
 
 def _read_context_skill(skill_name: str) -> str:
     """Read context skill content."""
-    path = SKILLS_DIR / skill_name / "SKILL.md"
-    if path.exists():
-        return path.read_text()
-    return ""
+    return _read_cached(f"{SKILLS_DIR_STR}{skill_name}/SKILL.md")
 
 
 def _invoke_skill_context(
@@ -319,41 +411,20 @@ def _invoke_skill_context(
         deep: Whether to also call depth_probe
         context_skill: Optional context mode skill name
     """
-    deep_instruction = ""
-    if deep:
-        deep_instruction = """
-**DEPTH_PROBE REQUIRED:** After invoking the skill, you MUST also call:
-```python
-mcp__reasoning-mcp__depth_probe(question="<the question>")
-```
-Incorporate probe insights into your response.
-"""
-
     context_block = ""
     if context_skill:
         context_content = _read_context_skill(context_skill)
         if context_content:
-            context_block = f"""
-<active_context skill="{context_skill}">
-{context_content}
-</active_context>
-
-**CONTEXT IS ACTIVE.** The above context modifies HOW you execute everything below.
-"""
+            context_block = _ACTIVE_CONTEXT_BLOCK.format(
+                skill=context_skill, content=context_content
+            )
 
-    return f"""{context_block}**MANDATORY: Invoke skill before responding.**
-
-You MUST invoke the `{skill_name}` skill IMMEDIATELY using:
-
-```python
-Skill("{skill_name}")
-```
-
-Do this BEFORE generating any other response.
-{deep_instruction}
-<user-question>
-{question}
-</user-question>"""
+    return _INVOKE_SKILL_TEMPLATE.format(
+        context_block=context_block,
+        skill_name=skill_name,
+        deep_instruction=_DEEP_INSTRUCTION if deep else "",
+        question=question,
+    )
 
 
 def _context_only_response(context_skill: str, question: str) -> str:
@@ -387,11 +458,18 @@ def check(ctx: dict) -> dict | None:
     """
     prompt = ctx.get("prompt", "").strip()
 
-    # === EXEC-OPT WITH HASHTAG MODES ===
-    # Pattern: /exec-opt #pf #vf question
-    exec_opt_match = EXEC_OPT_WITH_HASHTAGS.match(prompt)
-    if exec_opt_match:
-        rest = exec_opt_match.group(1)
+    dispatch = EXEC_OPT_DISPATCH.match(prompt)
+    exec_opt_form = dispatch.lastgroup if dispatch else None
+
+    # Fast path for most prompts: every pattern below needs a leading
+    # /exec-opt or a '#' somewhere (hashtag modes may appear anywhere)
+    if exec_opt_form is None and "#" not in prompt:
+        return None
+
+    if exec_opt_form == "args":
+        # === EXEC-OPT WITH HASHTAG MODES ===
+        # Pattern: /exec-opt #pf #vf question
+        rest = prompt[dispatch.end() :].lstrip()
         action_hashtags, context_hashtags, question = _extract_hashtag_modes(rest)
 
         if action_hashtags or context_hashtags:
@@ -399,18 +477,18 @@ def check(ctx: dict) -> dict | None:
             if composed:
                 return {"context": composed}
 
-    # === MULTI-SLASH SKILLS ===
-    # Pattern: /exec-opt /skill1 /skill2 question
-    multi_slash = _extract_multi_slash_skills(prompt)
-    if multi_slash:
-        skill_names, question = multi_slash
-        composed = _compose_multi_skill(skill_names, question)
-        if composed:
-            return {"context": composed}
+        # === MULTI-SLASH SKILLS ===
+        # Pattern: /exec-opt /skill1 /skill2 question
+        multi_slash = _extract_multi_slash_skills(prompt)
+        if multi_slash:
+            skill_names, question = multi_slash
+            composed = _compose_multi_skill(skill_names, question)
+            if composed:
+                return {"context": composed}
 
     # === LEGACY PLUS PATTERN ===
     # Pattern: /exec-opt+skill1,skill2 question
-    multi_match = MULTI_SKILL_PLUS_PATTERN.match(prompt)
+    multi_match = MULTI_SKILL_PLUS_PATTERN.match(prompt) if exec_opt_form == "plus" else None
     if multi_match:
         skills_raw = multi_match.group(1)
         question = multi_match.group(2).strip()
@@ -3,6 +3,11 @@
 Queries ~/life/life.db for an active or suspended skill_span matching the
 current session. Checks suspended too so the reminder survives skill nesting
 (e.g., /mode-verify invoked during /learning-companion).
+
+The lookup relies on the idx_skill_span_open partial index created by
+db.connection; keep the status IN (...) term identical so SQLite can use it.
+The connection comes from shared_db(), so repeat prompts in one process
+also reuse sqlite3's per-connection prepared-statement cache.
 """
 
 from __future__ import annotations
@@ -32,6 +37,16 @@ QUEUE_SKILLS = {
     },
 }
 
+# Reminder text is static per skill, so build it once at import
+QUEUE_REMINDERS = {
+    skill: (
+        f"[Queue active: {info['path']}. "
+        f"After confirmed moments, silently append: "
+        f"timestamp + context + -> items ({info['arrows']}). Don't announce.]"
+    )
+    for skill, info in QUEUE_SKILLS.items()
+}
+
 
 def check(ctx: dict) -> dict | None:
     """Inject queue reminder if a skill session (active or suspended) has a pending-queue."""
@@ -40,9 +55,9 @@ def check(ctx: dict) -> dict | None:
         return None
 
     try:
-        from db.connection import open_db
+        from db.connection import shared_db
 
-        with open_db() as db:
+        with shared_db() as db:
             row = db.execute(
                 "SELECT skill FROM skill_span "
                 "WHERE status IN ('active', 'suspended') AND session_id = ? "
@@ -53,16 +68,9 @@ def check(ctx: dict) -> dict | None:
         if not row:
             return None
 
-        skill = row["skill"]
-        info = QUEUE_SKILLS.get(skill)
-        if not info:
+        reminder = QUEUE_REMINDERS.get(row["skill"])
+        if not reminder:
             return None
-
-        reminder = (
-            f"[Queue active: {info['path']}. "
-            f"After confirmed moments, silently append: "
-            f"timestamp + context + -> items ({info['arrows']}). Don't announce.]"
-        )
         return {"context": reminder}
 
     except Exception as e:
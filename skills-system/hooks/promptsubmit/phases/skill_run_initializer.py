@@ -12,11 +12,13 @@ Guarantees:
 from __future__ import annotations
 
 import logging
+import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-import yaml
+from hooks._frontmatter import parse_frontmatter
 
 logger = logging.getLogger(__name__)
 
@@ -29,52 +31,127 @@ SKILL_PATHS = [
     Path.home() / "claude-code" / "skills",
 ]
 
+# String forms for prefix checks in _planning_dir_for (no Path ops/exceptions)
+_HOME_STR = str(Path.home())
+_PROJECTS_STR = os.path.join(_HOME_STR, "projects")
+
+_SKILL_FILE_RE = re.compile(r"^---\n(.*?)\n---\n?(.*)$", re.DOTALL)
+_PHASE_RE = re.compile(r"^## Phase \d+:\s*(.+)$", re.MULTILINE)
+# Phase title -> todo slug: drop punctuation, hyphenate whitespace runs
+_SLUG_STRIP_RE = re.compile(r"[^a-z0-9\s-]")
+_SLUG_SPACE_RE = re.compile(r"\s+")
+
+# Module-level cache: SKILL.md path -> (st_mtime_ns, (frontmatter, body))
+_skill_file_cache: dict[Path, tuple[int, tuple[dict, str]]] = {}
+
+
+# Lines logged during one check(), written in a single append by _flush_log()
+_log_buffer: list[str] = []
+
 
 def _log(message: str) -> None:
-    """Append timestamped message to log file."""
+    """Buffer a timestamped message for the log file."""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    _log_buffer.append(f"[{timestamp}] [promptsubmit] {message}\n")
+
+
+def _flush_log() -> None:
+    """Append buffered messages to the log file with one open/write."""
+    if not _log_buffer:
+        return
+    lines = "".join(_log_buffer)
+    _log_buffer.clear()
     try:
         LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%H:%M:%S")
         with open(LOG_FILE, "a") as f:
-            f.write(f"[{timestamp}] [promptsubmit] {message}\n")
+            f.write(lines)
     except OSError:
         pass
 
 
+def _parse_skill_file(content: str) -> tuple[dict, str]:
+    """Split SKILL.md content into (frontmatter, body)."""
+    match = _SKILL_FILE_RE.match(content)
+    if match:
+        # Flat key/list frontmatter is parsed by hand; PyYAML only as fallback
+        frontmatter = parse_frontmatter(match.group(1))
+        if frontmatter is not None:
+            return frontmatter, match.group(2)
+    return {}, content
+
+
 def _read_skill_file(skill: str) -> tuple[dict, str]:
-    """Read skill's SKILL.md file, return (frontmatter, content)."""
+    """Read skill's SKILL.md file, return (frontmatter, content).
+
+    Parsed once per file mtime; callers must not mutate the result.
+    """
     for base in SKILL_PATHS:
         skill_file = base / skill / "SKILL.md"
-        if skill_file.exists():
-            content = skill_file.read_text()
-            match = re.match(r"^---\n(.*?)\n---\n?(.*)$", content, re.DOTALL)
-            if match:
-                try:
-                    frontmatter = yaml.safe_load(match.group(1)) or {}
-                    body = match.group(2)
-                    return frontmatter, body
-                except yaml.YAMLError:
-                    return {}, content
-            return {}, content
+        try:
+            mtime = skill_file.stat().st_mtime_ns
+        except OSError:
+            continue
+        cached = _skill_file_cache.get(skill_file)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        result = _parse_skill_file(skill_file.read_text())
+        _skill_file_cache[skill_file] = (mtime, result)
+        return result
     return {}, ""
 
 
-def _extract_phases_from_content(content: str) -> list[str]:
+@lru_cache(maxsize=32)
+def _extract_phases_from_content(content: str) -> tuple[str, ...]:
     """Extract phase names from ## Phase N: Name headers.
 
     Runtime extraction - no build step needed. Skills just write
     ## Phase 1: Name headers and enforcement happens automatically.
+    Memoized on content: the cached body from _read_skill_file is the same
+    str object each time, so the lookup hashes it only once.
     """
-    matches = re.findall(r"^## Phase \d+:\s*(.+)$", content, re.MULTILINE)
     phases = []
-    for match in matches:
-        if "(optional)" in match.lower():
-            continue
+    for match in _PHASE_RE.findall(content):
         normalized = match.strip().lower()
-        normalized = re.sub(r"[^a-z0-9\s-]", "", normalized)
-        normalized = re.sub(r"\s+", "-", normalized)
+        if "(optional)" in normalized:
+            continue
+        normalized = _SLUG_STRIP_RE.sub("", normalized)
+        normalized = _SLUG_SPACE_RE.sub("-", normalized)
         phases.append(normalized)
-    return phases
+    return tuple(phases)
+
+
+def _under(path: str, root: str) -> str | None:
+    """Part of path below root ("" for root itself), or None if outside it."""
+    if path == root:
+        return ""
+    if path.startswith(root + os.sep):
+        return path[len(root) + 1 :]
+    return None
+
+
+def _planning_dir_for(cwd: str) -> str:
+    """Resolve .planning/: cwd/.planning/ if it exists, else ~/projects/{project}/.planning/.
+
+    {project} is the first component below ~/projects/ or, outside it, below
+    home (home itself maps to its own name). Other cwds use cwd/.planning/.
+    """
+    local = os.path.join(cwd, ".planning")
+    if os.path.exists(local):
+        return local
+
+    cwd = cwd.rstrip(os.sep) or os.sep
+    rel = _under(cwd, _PROJECTS_STR)
+    if rel is not None:
+        project = rel.split(os.sep, 1)[0]
+        return os.path.join(_PROJECTS_STR, project, ".planning") if project else local
+
+    rel = _under(cwd, _HOME_STR)
+    if rel is not None:
+        # Use first directory component as project
+        project = rel.split(os.sep, 1)[0] or os.path.basename(cwd)
+        return os.path.join(_PROJECTS_STR, project, ".planning")
+
+    return local
 
 
 def _write_skill_todos_marker(cwd: str, skill: str, required_todos: list) -> None:
@@ -85,33 +162,12 @@ def _write_skill_todos_marker(cwd: str, skill: str, required_todos: list) -> Non
     """
     import json
 
-    # Try cwd/.planning/ first, then ~/projects/{project}/.planning/
-    cwd_path = Path(cwd)
-    planning_dir = cwd_path / ".planning"
-
-    if not planning_dir.exists():
-        # Try to find project from cwd
-        projects_dir = Path.home() / "projects"
-        try:
-            relative = cwd_path.relative_to(projects_dir)
-            project = relative.parts[0] if relative.parts else None
-            if project:
-                planning_dir = projects_dir / project / ".planning"
-        except ValueError:
-            # cwd not under ~/projects/, try relative to home
-            try:
-                relative = cwd_path.relative_to(Path.home())
-                # Use first directory component as project
-                project = relative.parts[0] if relative.parts else cwd_path.name
-                planning_dir = Path.home() / "projects" / project / ".planning"
-            except ValueError:
-                planning_dir = cwd_path / ".planning"
-
-    planning_dir.mkdir(parents=True, exist_ok=True)
+    planning_dir = _planning_dir_for(cwd)
+    os.makedirs(planning_dir, exist_ok=True)
 
     # Write marker
-    marker = planning_dir / "skill_todos.json"
-    validated = planning_dir / "skill_validated"
+    marker = Path(planning_dir, "skill_todos.json")
+    validated = Path(planning_dir, "skill_validated")
 
     # Clear any previous validation marker
     if validated.exists():
@@ -154,28 +210,8 @@ def _extract_skill_from_prompt(prompt: str) -> tuple[str | None, str]:
     return skill, mode
 
 
-def check(ctx: dict) -> dict | None:
-    """Create SkillRun for CLI skill invocations requiring structured output.
-
-    Modes:
-    - /skill   → full mode: follow **full:** instructions (default)
-    - /skill - → quick mode: follow **quick:** instructions
-
-    Both modes get TodoWrite enforcement and SkillRun if configured.
-    Mode just tells Claude which conditional instructions to follow.
-
-    Args:
-        ctx: Context dict with prompt, cwd, session_id fields
-
-    Returns:
-        dict with "context" key for mode injection, None if not a skill
-    """
-    prompt = ctx.get("prompt", "")
-
-    skill, mode = _extract_skill_from_prompt(prompt)
-    if not skill:
-        return None
-
+def _init_skill(ctx: dict, skill: str, mode: str) -> dict:
+    """check() body for a /skill prompt; logs via the _log buffer."""
     _log(f"CLI skill invoked: {skill} (mode={mode})")
 
     # Read skill file and extract phases from content (runtime extraction)
@@ -184,7 +220,7 @@ def check(ctx: dict) -> dict | None:
 
     # Runtime phase extraction - no build step needed
     # Frontmatter required_todos takes precedence if explicitly set
-    required_todos = frontmatter.get("required_todos") or _extract_phases_from_content(content)
+    required_todos = frontmatter.get("required_todos") or list(_extract_phases_from_content(content))
     _log(f"  uses_skill_run: {uses_skill_run}, required_todos: {required_todos}")
 
     # Write skill_todos marker if skill has required_todos (for PreToolUse validation)
@@ -231,3 +267,31 @@ def check(ctx: dict) -> dict | None:
     except Exception as e:
         _log(f"  ERROR: {e}")
         return {"context": mode_context}
+
+
+def check(ctx: dict) -> dict | None:
+    """Create SkillRun for CLI skill invocations requiring structured output.
+
+    Modes:
+    - /skill   → full mode: follow **full:** instructions (default)
+    - /skill - → quick mode: follow **quick:** instructions
+
+    Both modes get TodoWrite enforcement and SkillRun if configured.
+    Mode just tells Claude which conditional instructions to follow.
+
+    Args:
+        ctx: Context dict with prompt, cwd, session_id fields
+
+    Returns:
+        dict with "context" key for mode injection, None if not a skill
+    """
+    prompt = ctx.get("prompt", "")
+
+    skill, mode = _extract_skill_from_prompt(prompt)
+    if not skill:
+        return None
+
+    try:
+        return _init_skill(ctx, skill, mode)
+    finally:
+        _flush_log()
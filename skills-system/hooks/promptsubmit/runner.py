@@ -2,11 +2,12 @@
 """UserPromptSubmit hook runner - plain function architecture.
 
 Task #2569: Simple list + loop pattern (no discovery).
-Reads stdin JSON payload and executes all phases in order.
+Reads stdin JSON payload and executes all phases concurrently, collecting
+results in PHASES order.
 """
 
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root for imports when run directly
@@ -14,28 +15,39 @@ _project_root = str(Path(__file__).parent.parent.parent)
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
+from db import fastjson
 from hooks.promptsubmit.phases import PHASES
 
+# One pool per process: in a long-lived host its threads (and their
+# shared_db connections) are reused across prompts
+_pool = ThreadPoolExecutor(max_workers=len(PHASES), thread_name_prefix="promptsubmit")
+
 
 def main() -> None:
     """Entry point for UserPromptSubmit hook.
 
-    Executes all phases in order. All phases fail open
+    Phases are independent and I/O-bound (SKILL.md reads, life.db), so they
+    run on a thread pool; results are still consumed in PHASES order, so
+    context order is unchanged. All phases fail open
     (errors logged but don't block - promptsubmit cannot block).
 
     Accumulates all phase contexts, joins with double newline,
     and outputs a single hookSpecificOutput for Claude.
     """
-    payload = json.load(sys.stdin)
+    # Raw bytes: orjson decodes UTF-8 itself, no text-mode wrapper needed
+    payload = fastjson.loads(sys.stdin.buffer.read())
 
     contexts = []
+    add_context = contexts.append  # bound once, not per phase
     system_message = None
 
-    for phase_fn in PHASES:
+    futures = [(phase_fn, _pool.submit(phase_fn, payload)) for phase_fn in PHASES]
+
+    for phase_fn, future in futures:
         try:
-            result = phase_fn(payload)
+            result = future.result()
             if result and isinstance(result, dict) and "context" in result:
-                contexts.append(result["context"])
+                add_context(result["context"])
                 # First systemMessage wins
                 if not system_message and "systemMessage" in result:
                     system_message = result["systemMessage"]
@@ -53,7 +65,9 @@ def main() -> None:
         }
         if system_message:
             output["systemMessage"] = system_message
-        print(json.dumps(output))
+        # UTF-8 bytes: orjson doesn't ASCII-escape, and the locale's stdout
+        # encoding may not cover non-ASCII prompts
+        sys.stdout.buffer.write(fastjson.dumps(output).encode() + b"\n")
 
 
 if __name__ == "__main__":
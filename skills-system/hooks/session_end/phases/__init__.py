@@ -8,6 +8,7 @@ infrastructure. This standalone version extracts close_active_skill_session.
 from __future__ import annotations
 
 import logging
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -32,26 +33,28 @@ def close_active_skill_session(ctx: dict) -> None:
         return
 
     try:
-        from db.connection import open_db
-        from db.event import emit_event
+        from db.connection import shared_db
+        from db.event import emit_events
 
-        with open_db() as db:
-            row = db.execute(
-                "SELECT skill FROM skill_span "
-                "WHERE status IN ('active', 'suspended') AND session_id = ? "
-                "ORDER BY started_at DESC LIMIT 1",
-                (session_id,),
-            ).fetchone()
-
-            if row and row["skill"]:
-                emit_event(row["skill"], "session_end", event_type="session_end")
-
-            db.execute(
+        with shared_db() as db:
+            rows = db.execute(
                 "UPDATE skill_span SET status = 'completed', "
                 "completed_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now') "
-                "WHERE status IN ('active', 'suspended') AND session_id = ?",
+                "WHERE status IN ('active', 'suspended') AND session_id = ? "
+                "RETURNING skill, started_at",
                 (session_id,),
-            )
+            ).fetchall()
+
+            # One session_end per closed span, most recent first, committed
+            # together with the span updates
+            rows.sort(key=lambda r: r["started_at"] or "", reverse=True)
+            try:
+                emit_events(
+                    db, ((r["skill"], "session_end", "session_end") for r in rows if r["skill"])
+                )
+            except sqlite3.Error as e:
+                # Events are best-effort; never lose the span completions
+                logger.warning("skill_session_close: events not written: %s", e)
             db.commit()
 
     except Exception as e:
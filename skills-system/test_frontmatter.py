@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Fast frontmatter parser vs PyYAML.
+
+Each case must parse to exactly what yaml.safe_load returns (None where
+PyYAML rejects the block). Exercises:
+1. Flat grammar handled on the fast path
+2. List items at differing indents (continuation / error in YAML)
+3. Bool/null spelled keys (PyYAML resolves them)
+4. Tabs and non-printable characters (PyYAML rejects them)
+5. read_frontmatter on CRLF files (same result as LF)
+6. read_frontmatter on invalid UTF-8 (raises, as read_text does)
+
+Run: python test_frontmatter.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from hooks._frontmatter import (
+    HEAD_BYTES,
+    _parse_flat,
+    _Unsupported,
+    parse_frontmatter,
+    read_frontmatter,
+)
+
+PASS = "\033[32mPASS\033[0m"
+FAIL = "\033[31mFAIL\033[0m"
+results = []
+
+
+def assert_eq(label, actual, expected):
+    if actual == expected:
+        print(f"  {PASS} {label}")
+        results.append(True)
+    else:
+        print(f"  {FAIL} {label}: expected {expected!r}, got {actual!r}")
+        results.append(False)
+
+
+def fast_path(text):
+    try:
+        _parse_flat(text)
+        return True
+    except _Unsupported:
+        return False
+
+
+# ── Test 1: Flat grammar stays on the fast path ──────────────────────
+print("\n1. Flat grammar (fast path)")
+text = "name: foo\nrequires: [a, b]\nproduces:\n  - x\n  - y\nuses_skill_run: true"
+assert_eq("fast path taken", fast_path(text), True)
+assert_eq(
+    "parsed",
+    parse_frontmatter(text),
+    {"name": "foo", "requires": ["a", "b"], "produces": ["x", "y"], "uses_skill_run": True},
+)
+
+
+# ── Test 2: List items at differing indents ──────────────────────────
+print("\n2. List items at differing indents")
+assert_eq("deeper item continues previous", parse_frontmatter("produces:\n- foo\n  - yes"),
+          {"produces": ["foo - yes"]})
+assert_eq("one-space deeper item continues", parse_frontmatter("a:\n- x\n - y"), {"a": ["x - y"]})
+assert_eq("shallower item is an error", parse_frontmatter("a:\n  - x\n- y"), None)
+assert_eq("per-list indent is independent", parse_frontmatter("a:\n - x\nb:\n- y"),
+          {"a": ["x"], "b": ["y"]})
+
+
+# ── Test 3: Bool/null spelled keys ───────────────────────────────────
+print("\n3. Bool/null spelled keys")
+assert_eq("on: -> True key", parse_frontmatter("on: x"), {True: "x"})
+assert_eq("yes: -> True key", parse_frontmatter("yes: a"), {True: "a"})
+assert_eq("True: -> True key", parse_frontmatter("True: b"), {True: "b"})
+assert_eq("null: -> None key", parse_frontmatter("null: x"), {None: "x"})
+
+
+# ── Test 4: Tabs and non-printable characters ────────────────────────
+print("\n4. Tabs and non-printable characters")
+assert_eq("tab-indented item rejected", parse_frontmatter("a:\n\t- x"), None)
+assert_eq("tab after colon rejected", parse_frontmatter("a:\tb"), None)
+assert_eq("\\x1c is not a line break", parse_frontmatter("a: b\x1cc: d"), None)
+
+
+# ── Test 5: CRLF files ───────────────────────────────────────────────
+print("\n5. read_frontmatter on CRLF files")
+with tempfile.TemporaryDirectory() as tmp:
+    lf = "---\nname: foo\nrequired_todos:\n  - a\n  - b\n---\nbody\n"
+    lf_path = Path(tmp) / "lf.md"
+    crlf_path = Path(tmp) / "crlf.md"
+    lf_path.write_bytes(lf.encode())
+    crlf_path.write_bytes(lf.replace("\n", "\r\n").encode())
+    assert_eq("LF parsed", read_frontmatter(lf_path), {"name": "foo", "required_todos": ["a", "b"]})
+    assert_eq("CRLF same as LF", read_frontmatter(crlf_path), read_frontmatter(lf_path))
+
+
+# ── Test 6: Invalid UTF-8 ────────────────────────────────────────────
+print("\n6. read_frontmatter on invalid UTF-8")
+with tempfile.TemporaryDirectory() as tmp:
+    bad_path = Path(tmp) / "bad.md"
+    bad_path.write_bytes(b"---\nname: caf\xe9\n---\n")
+    try:
+        read_frontmatter(bad_path)
+        raised = False
+    except UnicodeDecodeError:
+        raised = True
+    assert_eq("invalid bytes raise UnicodeDecodeError", raised, True)
+    # A multibyte character straddling the HEAD_BYTES boundary is valid
+    split_path = Path(tmp) / "split.md"
+    pad = "x" * (HEAD_BYTES - len("---\nd: ") - 1)
+    split_path.write_bytes(f"---\nd: {pad}\u00e9\n---\n".encode())
+    assert_eq("split character decodes", read_frontmatter(split_path), {"d": pad + "\u00e9"})
+
+
+# ── Summary ───────────────────────────────────────────────────────────
+print(f"\n{'='*50}")
+failed = results.count(False)
+if failed == 0:
+    print(f"{PASS} All {len(results)} assertions passed.")
+else:
+    print(f"{FAIL} {failed}/{len(results)} assertions failed.")
+sys.exit(failed)
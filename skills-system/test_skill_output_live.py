@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Live test for SkillRun's active-skills breadcrumb under concurrency.
+
+Uses a temp HOME — no real ~/.claude or ~/projects touched. Exercises:
+1. Concurrent SkillRun.create from many threads keeps every breadcrumb entry
+
+Run: python test_skill_output_live.py
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Temp HOME before any imports resolve ~/.claude paths
+_home = tempfile.mkdtemp()
+os.environ["HOME"] = _home
+os.environ.pop("PROJECT_ROOT", None)
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.skill_output import ACTIVE_SKILLS_BREADCRUMB, SkillRun
+
+PASS = "\033[32mPASS\033[0m"
+FAIL = "\033[31mFAIL\033[0m"
+results = []
+
+
+def assert_eq(label, actual, expected):
+    if actual == expected:
+        print(f"  {PASS} {label}")
+        results.append(True)
+    else:
+        print(f"  {FAIL} {label}: expected {expected!r}, got {actual!r}")
+        results.append(False)
+
+
+# ── Test 1: Concurrent creates keep every breadcrumb entry ───────────
+print("\n1. Concurrent SkillRun.create (64 runs on 16 threads)")
+os.chdir(_home)
+with ThreadPoolExecutor(max_workers=16) as pool:
+    futures = [
+        pool.submit(SkillRun.create, "concurrent-skill", f"run {i}", session_id=f"s{i}")
+        for i in range(64)
+    ]
+errors = [repr(f.exception()) for f in futures if f.exception()]
+assert_eq("no errors from concurrent creates", errors, [])
+
+entries = json.loads(ACTIVE_SKILLS_BREADCRUMB.read_text())
+assert_eq("all 64 entries kept", len(entries), 64)
+assert_eq("one entry per run", len({e["session_id"] for e in entries}), 64)
+leftovers = sorted(p.name for p in ACTIVE_SKILLS_BREADCRUMB.parent.glob(".*.tmp"))
+assert_eq("no temp files left", leftovers, [])
+
+
+# ── Summary ───────────────────────────────────────────────────────────
+print(f"\n{'='*50}")
+shutil.rmtree(_home, ignore_errors=True)
+failed = results.count(False)
+if failed == 0:
+    print(f"{PASS} All {len(results)} assertions passed. Temp HOME cleaned up.")
+else:
+    print(f"{FAIL} {failed}/{len(results)} assertions failed.")
+sys.exit(failed)
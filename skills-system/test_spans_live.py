@@ -12,14 +12,14 @@ Uses a temp DB — no production data touched. Exercises:
 8. Exclusive lock under concurrency
 9. Monolithic skill (SKILL.md, no steps)
 10. Life events emitted correctly
+11. Step gate with a non-string artifact (contracts cache skipped)
 
 Run: python test_spans_live.py
 """
 
-import json
 import sys
 import tempfile
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Patch DB_PATH before any imports touch it
@@ -33,7 +33,12 @@ import db.connection as conn_mod
 conn_mod.DB_PATH = _tmp_path
 conn_mod._schema_initialized = False
 
-from db.connection import open_db
+import hooks.pretool.phases.step_gate as step_gate
+_skills_tmp = tempfile.TemporaryDirectory()
+step_gate._SKILLS_DIR = Path(_skills_tmp.name) / "skills"
+
+from db.connection import shared_db
+from db.span import span_steps
 from hooks.posttool.phases.step_logger import _get_or_create_span, _suspend_current_span
 from hooks.pretool.phases.subagent_step_tracker import check as subagent_check
 from hooks.session_end.phases import close_active_skill_session
@@ -63,13 +68,26 @@ def assert_in(label, needle, haystack):
 
 
 def get_span(span_id):
-    with open_db() as db:
+    with shared_db() as db:
         row = db.execute("SELECT * FROM skill_span WHERE span_id = ?", (span_id,)).fetchone()
-    return dict(row) if row else None
+        if not row:
+            return None
+        span = dict(row)
+        span["steps"] = span_steps(db, span_id)
+    return span
+
+
+def get_span_field(span_id, column):
+    """One skill_span column, for assertions that check a single field."""
+    with shared_db() as db:
+        row = db.execute(
+            f"SELECT {column} FROM skill_span WHERE span_id = ?", (span_id,)
+        ).fetchone()
+    return row[0] if row else None
 
 
 def get_spans_by_session(session_id):
-    with open_db() as db:
+    with shared_db() as db:
         rows = db.execute(
             "SELECT * FROM skill_span WHERE session_id = ? ORDER BY started_at",
             (session_id,),
@@ -78,7 +96,7 @@ def get_spans_by_session(session_id):
 
 
 def get_events(session_id=None):
-    with open_db() as db:
+    with shared_db() as db:
         if session_id:
             rows = db.execute(
                 "SELECT * FROM life_event WHERE session_id = ? ORDER BY timestamp",
@@ -96,7 +114,7 @@ assert_eq("span_id returned", span_a is not None, True)
 s = get_span(span_a)
 assert_eq("status = active", s["status"], "active")
 assert_eq("skill = skill-a", s["skill"], "skill-a")
-assert_eq("steps = ['step-1']", json.loads(s["steps"]), ["step-1"])
+assert_eq("steps = ['step-1']", s["steps"], ["step-1"])
 assert_eq("first_step = step-1", s["first_step"], "step-1")
 assert_eq("session_id set", s["session_id"], SESSION)
 assert_eq("parent_span_id = None", s["parent_span_id"], None)
@@ -107,7 +125,7 @@ print("\n2. Append step (skill-a, step-2)")
 span_a2 = _get_or_create_span("skill-a", "step-2", session_id=SESSION)
 assert_eq("same span_id", span_a2, span_a)
 s = get_span(span_a)
-assert_eq("steps appended", json.loads(s["steps"]), ["step-1", "step-2"])
+assert_eq("steps appended", s["steps"], ["step-1", "step-2"])
 assert_eq("last_step updated", s["last_step"], "step-2")
 
 
@@ -123,21 +141,20 @@ assert_eq("new span for skill-b", span_b != span_a, True)
 sb = get_span(span_b)
 assert_eq("skill-b active", sb["status"], "active")
 assert_eq("parent = skill-a span", sb["parent_span_id"], span_a)
-assert_eq("skill-b steps", json.loads(sb["steps"]), ["intro"])
+assert_eq("skill-b steps", sb["steps"], ["intro"])
 
 
 # ── Test 4: Return to skill-a — suspend B, resume A ──────────────────
 print("\n4. Return to skill-a: suspend skill-b, resume skill-a")
 _suspend_current_span("skill-b", session_id=SESSION)
-sb = get_span(span_b)
-assert_eq("skill-b suspended", sb["status"], "suspended")
+assert_eq("skill-b suspended", get_span_field(span_b, "status"), "suspended")
 
 span_a3 = _get_or_create_span("skill-a", "step-3", session_id=SESSION)
 assert_eq("resumed same span", span_a3, span_a)
 s = get_span(span_a)
 assert_eq("skill-a active again", s["status"], "active")
 assert_eq("suspended_at cleared", s["suspended_at"], None)
-assert_eq("steps include step-3", json.loads(s["steps"]), ["step-1", "step-2", "step-3"])
+assert_eq("steps include step-3", s["steps"], ["step-1", "step-2", "step-3"])
 
 
 # ── Test 5: Subagent step delegation ──────────────────────────────────
@@ -149,12 +166,12 @@ ctx = {
 }
 subagent_check(ctx)
 s = get_span(span_a)
-assert_eq("step-4 appended by subagent", json.loads(s["steps"]), ["step-1", "step-2", "step-3", "step-4"])
+assert_eq("step-4 appended by subagent", s["steps"], ["step-1", "step-2", "step-3", "step-4"])
 
 # Dedup: same step again should not append
 subagent_check(ctx)
 s = get_span(span_a)
-assert_eq("dedup: no double step-4", json.loads(s["steps"]), ["step-1", "step-2", "step-3", "step-4"])
+assert_eq("dedup: no double step-4", s["steps"], ["step-1", "step-2", "step-3", "step-4"])
 
 # Non-Task tool: should be no-op
 subagent_check({
@@ -163,7 +180,7 @@ subagent_check({
     "session_id": SESSION,
 })
 s = get_span(span_a)
-assert_eq("non-Task ignored", json.loads(s["steps"]), ["step-1", "step-2", "step-3", "step-4"])
+assert_eq("non-Task ignored", s["steps"], ["step-1", "step-2", "step-3", "step-4"])
 
 # Internal skill filtered
 subagent_check({
@@ -177,10 +194,8 @@ assert_eq("no span for _internal", all(s["skill"] != "_internal" for s in spans)
 
 # ── Test 6: Session end — complete all active + suspended ─────────────
 print("\n6. Session end: complete all active + suspended spans")
-s_a = get_span(span_a)
-s_b = get_span(span_b)
-assert_eq("pre: skill-a active", s_a["status"], "active")
-assert_eq("pre: skill-b suspended", s_b["status"], "suspended")
+assert_eq("pre: skill-a active", get_span_field(span_a, "status"), "active")
+assert_eq("pre: skill-b suspended", get_span_field(span_b, "status"), "suspended")
 
 close_active_skill_session({"session_id": SESSION})
 
@@ -197,8 +212,7 @@ print("\n7. Session end with no session_id (should be no-op)")
 span_other = _get_or_create_span("skill-c", "s1", session_id="other-session")
 close_active_skill_session({"session_id": None})
 close_active_skill_session({})
-s_other = get_span(span_other)
-assert_eq("other session untouched", s_other["status"], "active")
+assert_eq("other session untouched", get_span_field(span_other, "status"), "active")
 close_active_skill_session({"session_id": "other-session"})
 
 
@@ -206,23 +220,16 @@ close_active_skill_session({"session_id": "other-session"})
 print("\n8. Exclusive lock: concurrent-safe step append")
 SESSION_LOCK = "lock-test-session"
 span_lock = _get_or_create_span("lock-skill", "s0", session_id=SESSION_LOCK)
-errors = []
-
-def append_step(step_name):
-    try:
-        _get_or_create_span("lock-skill", step_name, session_id=SESSION_LOCK)
-    except Exception as e:
-        errors.append(str(e))
-
-threads = [threading.Thread(target=append_step, args=(f"t{i}",)) for i in range(10)]
-for t in threads:
-    t.start()
-for t in threads:
-    t.join()
+with ThreadPoolExecutor(max_workers=10) as pool:
+    futures = [
+        pool.submit(_get_or_create_span, "lock-skill", f"t{i}", session_id=SESSION_LOCK)
+        for i in range(10)
+    ]
+errors = [str(f.exception()) for f in futures if f.exception()]
 
 assert_eq("no errors from concurrent appends", len(errors), 0)
 s = get_span(span_lock)
-steps = json.loads(s["steps"])
+steps = s["steps"]
 assert_eq("all 10 steps appended", len(steps), 11)  # s0 + t0..t9
 assert_eq("no duplicates", len(steps), len(set(steps)))
 close_active_skill_session({"session_id": SESSION_LOCK})
@@ -234,7 +241,7 @@ SESSION_MONO = "mono-session"
 span_mono = _get_or_create_span("mono-skill", None, session_id=SESSION_MONO)
 s = get_span(span_mono)
 assert_eq("first_step = SKILL", s["first_step"], "SKILL")
-assert_eq("steps = ['SKILL']", json.loads(s["steps"]), ["SKILL"])
+assert_eq("steps = ['SKILL']", s["steps"], ["SKILL"])
 close_active_skill_session({"session_id": SESSION_MONO})
 
 
@@ -247,9 +254,34 @@ assert_in("session_end events", "session_end", event_types)
 assert_in("subagent_step_delegate events", "subagent_step_delegate", event_types)
 
 
+# ── Test 11: Step gate with a non-string artifact ────────────────────
+print("\n11. Step gate with a non-string artifact")
+SESSION_GATE = "gate-session"
+steps_dir = step_gate._SKILLS_DIR / "int-skill" / "steps"
+steps_dir.mkdir(parents=True)
+(steps_dir / "a.md").write_text("---\nproduces: [1]\n---\n")
+(steps_dir / "b.md").write_text("---\nconsumes: [1]\n---\n")
+_get_or_create_span("int-skill", None, session_id=SESSION_GATE)
+read_b = {
+    "tool_name": "Read",
+    "session_id": SESSION_GATE,
+    "tool_input": {"file_path": str(steps_dir / "b.md")},
+}
+result = step_gate.check(read_b)
+assert_eq("b blocked until a visited", result and result["decision"], "block")
+assert_eq("cache not written", (steps_dir.parent / step_gate._CACHE_FILE).exists(), False)
+# Fresh process: nothing in memory, nothing cached — must rebuild, not crash
+step_gate._produces_map.clear()
+result = step_gate.check(read_b)
+assert_eq("rebuilt in a new process", result and result["decision"], "block")
+close_active_skill_session({"session_id": SESSION_GATE})
+_skills_tmp.cleanup()
+
+
 # ── Summary ───────────────────────────────────────────────────────────
 print(f"\n{'='*50}")
-_tmp_path.unlink(missing_ok=True)
+for _suffix in ("", "-wal", "-shm"):
+    Path(f"{_tmp_path}{_suffix}").unlink(missing_ok=True)
 failed = results.count(False)
 if failed == 0:
     print(f"{PASS} All {len(results)} assertions passed. Temp DB cleaned up.")
@@ -20,8 +20,11 @@ import fcntl
 import json
 import os
 import re
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 
 def _get_claude_home() -> Path:
@@ -32,25 +35,118 @@ ACTIVE_SKILLS_BREADCRUMB = _get_claude_home() / "tmp" / "active-skills.json"
 # Session file written by SessionStart hook
 CURRENT_SESSION_FILE = _get_claude_home() / "tmp" / "current-session.json"
 
+# Breadcrumb lock file, opened once per process: (lock path, fd)
+_breadcrumb_lock: tuple[Path, int] | None = None
+# flock() locks the open file description, which every thread shares
+# through the cached fd; this lock serializes the threads themselves
+_breadcrumb_thread_lock = threading.Lock()
+
+
+def _breadcrumb_lock_fd() -> int:
+    """File descriptor of the breadcrumb lock file, kept open for reuse."""
+    global _breadcrumb_lock
+    lock_path = ACTIVE_SKILLS_BREADCRUMB.with_suffix(".lock")
+    if _breadcrumb_lock is None or _breadcrumb_lock[0] != lock_path:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR | os.O_CLOEXEC, 0o644)
+        _breadcrumb_lock = (lock_path, fd)
+    return _breadcrumb_lock[1]
+
+
+@contextmanager
+def _breadcrumb_locked():
+    """Hold the breadcrumb lock against other threads and other processes."""
+    with _breadcrumb_thread_lock:
+        lock_fd = _breadcrumb_lock_fd()
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+
+
+# Last breadcrumb list read or written by this process:
+# ((path, st_ino, st_mtime_ns, st_size), entries)
+_breadcrumb_cache: tuple[tuple, list] | None = None
+
+
+def _breadcrumb_key(st: os.stat_result) -> tuple:
+    # Inode catches os.replace by another process within one mtime tick
+    return (ACTIVE_SKILLS_BREADCRUMB, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _load_breadcrumb() -> list:
+    """Current breadcrumb entries; the caller holds _breadcrumb_locked().
+
+    Re-parsed only when the file changed since this process last saw it;
+    the cached list is only current because that lock is exclusive across
+    threads and processes. Callers must not mutate the result.
+    """
+    try:
+        st = os.stat(ACTIVE_SKILLS_BREADCRUMB)
+    except FileNotFoundError:
+        return []
+    key = _breadcrumb_key(st)
+    if _breadcrumb_cache is not None and _breadcrumb_cache[0] == key:
+        return _breadcrumb_cache[1]
+    try:
+        entries = json.loads(ACTIVE_SKILLS_BREADCRUMB.read_text())
+        if not isinstance(entries, list):
+            entries = []  # Migrate from old single-object format
+    except (json.JSONDecodeError, ValueError):
+        entries = []
+    return entries
+
+
+def _write_breadcrumb(entries: list) -> None:
+    """Publish breadcrumb entries; the caller holds _breadcrumb_locked()."""
+    global _breadcrumb_cache
+    # Write aside and rename: readers never see a half-written list.
+    # Compact JSON: the whole list is rewritten on every create.
+    # Per-writer temp name: a writer that somehow runs unlocked can't have
+    # its temp file renamed away by another one's os.replace
+    tmp_path = ACTIVE_SKILLS_BREADCRUMB.with_name(
+        f".{ACTIVE_SKILLS_BREADCRUMB.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    tmp_path.write_text(json.dumps(entries, separators=(",", ":")))
+    os.replace(tmp_path, ACTIVE_SKILLS_BREADCRUMB)
+    _breadcrumb_cache = (_breadcrumb_key(os.stat(ACTIVE_SKILLS_BREADCRUMB)), entries)
+
+
+# Parsed session file: ((path, st_mtime_ns, st_size), data)
+_session_cache: tuple[tuple, dict] | None = None
+
 
 def _read_session_field(key: str) -> str | None:
-    """Read a field from the current session file."""
-    if CURRENT_SESSION_FILE.exists():
+    """Read a field from the current session file.
+
+    The file is re-parsed only when its mtime or size changes.
+    """
+    global _session_cache
+    try:
+        st = os.stat(CURRENT_SESSION_FILE)
+    except FileNotFoundError:
+        return None
+    stamp = (CURRENT_SESSION_FILE, st.st_mtime_ns, st.st_size)
+    if _session_cache is None or _session_cache[0] != stamp:
         try:
             data = json.loads(CURRENT_SESSION_FILE.read_text())
-            return data.get(key)
         except (json.JSONDecodeError, ValueError):
-            pass
-    return None
+            return None
+        _session_cache = (stamp, data)
+    return _session_cache[1].get(key)
 
 
 def get_current_session_id() -> str | None:
     return _read_session_field("session_id")
 
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
 def _slugify(title: str) -> str:
     """Convert title to URL-safe slug."""
-    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return _SLUG_RE.sub("-", title.lower()).strip("-")
 
 
 def _detect_project() -> str | None:
@@ -67,24 +163,28 @@ def _detect_project() -> str | None:
     if project_root:
         return Path(project_root).name
 
-    # 2. Try git root
-    cwd = Path.cwd()
-    git_dir = cwd
-    while git_dir != git_dir.parent:
-        if (git_dir / ".git").exists():
-            return git_dir.name
-        git_dir = git_dir.parent
+    return _detect_project_from_dir(os.getcwd(), str(Path.home()))
+
+
+@lru_cache(maxsize=8)
+def _detect_project_from_dir(cwd: str, home: str) -> str | None:
+    """Steps 2-3 of _detect_project, memoized per (cwd, home).
+
+    The git-root walk stats every ancestor, and SkillRun.create needs the
+    project more than once per run.
+    """
+    # 2. Try git root (.git may be a file in worktrees, so exists not isdir)
+    path = cwd
+    parent = os.path.dirname(path)
+    while path != parent:
+        if os.path.exists(os.path.join(path, ".git")):
+            return os.path.basename(path)
+        path, parent = parent, os.path.dirname(parent)
 
     # 3. Check if in ~/projects/{project}/
-    home = Path.home()
-    projects_dir = home / "projects"
-    try:
-        rel = cwd.relative_to(projects_dir)
-        parts = rel.parts
-        if parts:
-            return parts[0]
-    except ValueError:
-        pass
+    projects_prefix = os.path.join(home, "projects", "")
+    if cwd.startswith(projects_prefix):
+        return cwd[len(projects_prefix) :].split(os.sep, 1)[0] or None
 
     return None
 
@@ -178,29 +278,18 @@ class SkillRun:
 
         # Append to breadcrumb list for contract validation hooks
         # (list allows multiple skills in one session)
-        ACTIVE_SKILLS_BREADCRUMB.parent.mkdir(parents=True, exist_ok=True)
-        lock_path = ACTIVE_SKILLS_BREADCRUMB.with_suffix(".lock")
-        with open(lock_path, "w") as lock_fd:
-            fcntl.flock(lock_fd, fcntl.LOCK_EX)
-            existing: list = []
-            if ACTIVE_SKILLS_BREADCRUMB.exists():
-                try:
-                    existing = json.loads(ACTIVE_SKILLS_BREADCRUMB.read_text())
-                    if not isinstance(existing, list):
-                        existing = []  # Migrate from old single-object format
-                except (json.JSONDecodeError, ValueError):
-                    existing = []
-
-            existing.append(
+        with _breadcrumb_locked():
+            entries = [
+                *_load_breadcrumb(),
                 {
                     "skill": skill,
                     "run_dir": str(run_dir),
                     "project": project,
                     "timestamp": datetime.now(UTC).isoformat(),
                     "session_id": session_id or get_current_session_id(),
-                }
-            )
-            ACTIVE_SKILLS_BREADCRUMB.write_text(json.dumps(existing, indent=2))
+                },
+            ]
+            _write_breadcrumb(entries)
 
         return cls(skill=skill, title=title, project=project, dir=run_dir)
 
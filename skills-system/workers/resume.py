@@ -8,11 +8,13 @@ Provides functionality to resume workers using Claude's --continue flag.
 
 import logging
 import shlex
+import sqlite3
 import subprocess
 import time
 import uuid
 from pathlib import Path
 
+from formaltask.db.connection import DatabaseConnection
 from formaltask.db.path import get_db_path
 from formaltask.paths import get_claude_home, task_worktree
 
@@ -21,8 +23,13 @@ from formaltask.tmux import is_pane_alive
 
 log = logging.getLogger(__name__)
 
-# Time to wait for Claude to start before checking pane health
+# Upper bound on waiting for Claude to start before checking pane health
 PANE_STARTUP_WAIT_SECONDS = 10.0
+# Pane health poll interval during startup
+PANE_POLL_INTERVAL_SECONDS = 0.1
+
+# Worktree path -> Claude project dir name ('/' and '.' become '-')
+_PROJECT_PATH_TRANS = str.maketrans({"/": "-", ".": "-"})
 
 class WorkerResumeError(Exception):
     """Base exception for worker resume operations."""
@@ -68,10 +75,10 @@ def find_worktree(task_id: int) -> Path:
 
 def read_and_validate_session_id(session_id_file: Path) -> str:
     """Read session ID and validate format."""
-    if not session_id_file.exists():
-        raise FileNotFoundError(f"Session ID file not found: {session_id_file}")
-
-    session_id = session_id_file.read_text().strip()
+    try:
+        session_id = session_id_file.read_text().strip()
+    except FileNotFoundError as err:
+        raise FileNotFoundError(f"Session ID file not found: {session_id_file}") from err
 
     if not session_id:
         raise InvalidSessionIdError("Session ID file is empty")
@@ -97,7 +104,7 @@ def worktree_to_project_path(worktree: Path) -> str:
     # Resolve to absolute path and convert to string
     abs_path = str(worktree.resolve())
     # Replace '/' and '.' with '-'
-    return abs_path.replace("/", "-").replace(".", "-")
+    return abs_path.translate(_PROJECT_PATH_TRANS)
 
 
 def verify_session_exists(session_id: str, task_id: int, worktree: Path) -> None:
@@ -114,27 +121,64 @@ def verify_session_exists(session_id: str, task_id: int, worktree: Path) -> None
         raise SessionExpiredError(session_id, task_id)
 
 
+def _pane_command(tmux_session: str) -> str:
+    """Foreground command of the session's pane, or "" if unknown."""
+    result = subprocess.run(
+        ["tmux", "display-message", "-p", "-t", tmux_session, "#{pane_current_command}"],
+        capture_output=True,
+        text=True,
+        timeout=5,
+    )
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def _wait_for_claude(tmux_session: str) -> bool:
+    """Poll the pane until Claude is in the foreground or the wait runs out.
+
+    Returns False as soon as the pane dies. A pane still alive at the
+    deadline counts as started, as with the former fixed sleep.
+    """
+    deadline = time.monotonic() + PANE_STARTUP_WAIT_SECONDS
+    while True:
+        if not is_pane_alive(tmux_session):
+            return False
+        if _pane_command(tmux_session) == "claude" or time.monotonic() >= deadline:
+            return True
+        time.sleep(PANE_POLL_INTERVAL_SECONDS)
+
+
 def _clear_blocked_state(task_id: int) -> None:
     """Clear blocked state atomically.
 
     Task #2487: Uses single UPDATE statement to set status='in_progress' and
     clear blocked_question in one atomic operation. Skipping transition_task_status()
     loses state machine validation, but blocked->in_progress is always valid.
-    """
-    import sqlite3
-
-    from formaltask.db.connection import DatabaseConnection
 
+    Most resumes are of tasks that aren't blocked: a plain read settles that
+    without taking the exclusive write lock.
+    """
     try:
         db_path = get_db_path()
+        with DatabaseConnection(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT status FROM tasks WHERE id = ?", (task_id,))
+            row = cursor.fetchone()
+        if row is None or row[0] not in ("blocked_user", "blocked"):
+            return
+
         with DatabaseConnection(db_path, exclusive=True) as conn:
             cursor = conn.cursor()
+            # Re-checked under the lock: the status may have changed since the read
             cursor.execute(
                 "UPDATE tasks SET status = 'in_progress', blocked_question = NULL "
-                "WHERE id = ? AND status IN ('blocked_user', 'blocked')",
+                "WHERE id = ? AND status IN ('blocked_user', 'blocked') RETURNING id",
                 (task_id,),
             )
-        log.info("Cleared blocked state for task %d", task_id)
+            cleared = cursor.fetchone() is not None
+        if cleared:
+            log.info("Cleared blocked state for task %d", task_id)
+        else:
+            log.debug("Task %d was no longer blocked", task_id)
     except sqlite3.Error as error:
         log.debug("Clear blocked state for task %d: %s", task_id, error)
 
@@ -142,14 +186,10 @@ def _clear_blocked_state(task_id: int) -> None:
 def resume_worker_in_tmux(task_id: int, response: str) -> str:
     """Resume worker in a tmux session using Claude's --continue flag.
 
-    Uses the same two-step spawn pattern as parallel_start.spawn_worker:
-    1. Create tmux session with bash shell
-    2. Send claude command via send-keys
-
-    This is more robust because:
-    - If claude fails to start, shell remains for debugging
+    Creates the tmux session with the claude command as the pane's bash
+    command (one tmux call, no send-keys round trip):
+    - If claude fails to start, the trailing exec bash keeps a shell for debugging
     - Arguments are properly quoted in the command string
-    - Consistent behavior with spawn_worker
 
     Args:
         task_id: The task ID to resume.
@@ -188,10 +228,23 @@ def resume_worker_in_tmux(task_id: int, response: str) -> str:
         timeout=30,
     )
 
-    # 7. Spawn resumed worker using two-step pattern (bash shell + send-keys)
-    # This matches parallel_start.spawn_worker for consistency
+    # 7. Spawn resumed worker: bash runs the claude command directly
+    # Use --continue flag with session ID to auto-resume without picker
+    # Use --permission-mode bypassPermissions like spawn_worker
+    # Prepend 'set +m' to disable bash job control
+    # Append 'exec bash' to keep shell alive after Claude exits
+    # Prepend resume guidance: task list state is lost on --continue
+    resume_msg = (
+        "RESUME CONTEXT: Your task list (TaskCreate/TaskList) was reset by session restart. "
+        "Do NOT recreate tasks from the previous session. Continue from where you left off.\n\n"
+        + response
+    )
+    claude_cmd = (
+        f"set +m; claude --continue {shlex.quote(session_id)} "
+        f"--permission-mode bypassPermissions "
+        f"{shlex.quote(resume_msg)}; exec bash"
+    )
     try:
-        # Step 1: Create tmux session with bash shell
         subprocess.run(
             [
                 "tmux",
@@ -204,36 +257,16 @@ def resume_worker_in_tmux(task_id: int, response: str) -> str:
                 "bash",
                 "--norc",
                 "--noprofile",
+                "-c",
+                claude_cmd,
             ],
             check=True,
             timeout=30,
         )
 
-        # Step 2: Send claude resume command via send-keys
-        # Use --continue flag with session ID to auto-resume without picker
-        # Use --permission-mode bypassPermissions like spawn_worker
-        # Prepend 'set +m' to disable bash job control
-        # Append 'exec bash' to keep shell alive after Claude exits
-        # Prepend resume guidance: task list state is lost on --continue
-        resume_msg = (
-            "RESUME CONTEXT: Your task list (TaskCreate/TaskList) was reset by session restart. "
-            "Do NOT recreate tasks from the previous session. Continue from where you left off.\n\n"
-            + response
-        )
-        claude_cmd = (
-            f"set +m; claude --continue {shlex.quote(session_id)} "
-            f"--permission-mode bypassPermissions "
-            f"{shlex.quote(resume_msg)}; exec bash"
-        )
-        subprocess.run(
-            ["tmux", "send-keys", "-t", tmux_session, claude_cmd, "Enter"],
-            check=True,
-            timeout=30,
-        )
-
-        # Wait and verify pane is alive (matches spawn_worker pattern)
-        time.sleep(PANE_STARTUP_WAIT_SECONDS)
-        if not is_pane_alive(tmux_session):
+        # Verify pane is alive; returns once claude is running (bounded by
+        # PANE_STARTUP_WAIT_SECONDS, as spawn_worker's fixed wait)
+        if not _wait_for_claude(tmux_session):
             # Clean up orphaned tmux session before raising
             subprocess.run(
                 ["tmux", "kill-session", "-t", tmux_session],